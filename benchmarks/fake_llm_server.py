@@ -0,0 +1,333 @@
+"""
+Local stand-in for an OpenAI-compatible chat-completions endpoint.
+
+Serves canned JSON responses with configurable latency, jitter and error
+rate, in both regular and streaming (SSE) mode, so benchmarks never touch a
+real provider. The /files and /batches endpoints of the batch API are
+emulated too: a batch job completes `batch_latency` seconds after creation.
+Run standalone with:
+
+    python benchmarks/fake_llm_server.py --port 8000 --latency 0.2 --jitter 0.05
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSES = [
+    {
+        "content_type": "code",
+        "response": "def fibonacci(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n"
+                    "    return a\n\n\nprint(fibonacci(30))\n"
+    },
+    {
+        "content_type": "code",
+        "response": "import math\n\n\ndef area(radius):\n    return math.pi * radius ** 2\n\n\nprint(area(2))\n"
+    },
+]
+
+
+class FakeLLMServer:
+    """Threaded fake chat-completions server; `url` is the base_url to hand to the OpenAI client."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 429, responses: list = None,
+                 chunk_size: int = 16, seed: int = None, batch_latency: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_size = chunk_size
+        self.batch_latency = batch_latency
+        self.responses = [r if isinstance(r, str) else json.dumps(r) for r in (responses or DEFAULT_RESPONSES)]
+        self._responses = itertools.cycle(self.responses)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.files = {}
+        self.batches = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="FakeLLMServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _next_call(self):
+        """Picks the delay, whether to fail, and the canned content for one request."""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            content = next(self._responses)
+        return delay, fail, content
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "batches": len(self.batches)}
+
+    def _completion(self, body: dict, content: str) -> dict:
+        model = body.get("model", "fake-model")
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", ())) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }
+
+    def _add_file(self, content: bytes, purpose: str, filename: str) -> dict:
+        file = {"id": f"file-{uuid.uuid4().hex[:24]}", "object": "file", "bytes": len(content),
+                "created_at": int(time.time()), "filename": filename, "purpose": purpose}
+        with self._lock:
+            self.files[file["id"]] = dict(file, content=content)
+        return file
+
+    def _create_batch(self, body: dict) -> dict:
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": body.get("endpoint"),
+            "errors": None,
+            "input_file_id": body.get("input_file_id"),
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "metadata": body.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}
+        }
+        with self._lock:
+            if batch["input_file_id"] not in self.files:
+                batch.update(status="failed", errors={"object": "list", "data": [
+                    {"code": "invalid_file", "message": f"No such file: {batch['input_file_id']}"}]})
+            self.batches[batch["id"]] = dict(batch, ready_at=time.monotonic() + self.batch_latency)
+        return batch
+
+    def _get_batch(self, batch_id: str):
+        """Returns the public batch object, running the job once its latency has elapsed."""
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            if batch["status"] == "in_progress" and time.monotonic() >= batch["ready_at"]:
+                self._run_batch(batch)
+            return {key: value for key, value in batch.items() if key != "ready_at"}
+
+    def _run_batch(self, batch: dict):
+        # Called with the lock held; `_next_call` is inlined so error injection matches live requests
+        output, errors = [], []
+        lines = self.files[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+        for line in filter(str.strip, lines):
+            request = json.loads(line)
+            self.requests += 1
+            content = next(self._responses)
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                errors.append({"id": f"batch_req_{uuid.uuid4().hex[:16]}", "custom_id": request["custom_id"],
+                               "response": {"status_code": self.error_status, "body": {
+                                   "error": {"message": "Injected failure", "type": "fake_error"}}},
+                               "error": None})
+                continue
+            output.append({"id": f"batch_req_{uuid.uuid4().hex[:16]}", "custom_id": request["custom_id"],
+                           "response": {"status_code": 200, "body": self._completion(request["body"], content)},
+                           "error": None})
+
+        for key, rows in (("output_file_id", output), ("error_file_id", errors)):
+            if rows:
+                data = "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+                file_id = f"file-{uuid.uuid4().hex[:24]}"
+                self.files[file_id] = {"id": file_id, "object": "file", "bytes": len(data),
+                                       "created_at": int(time.time()), "filename": f"{key}.jsonl",
+                                       "purpose": "batch_output", "content": data}
+                batch[key] = file_id
+        batch.update(status="completed", completed_at=int(time.time()),
+                     request_counts={"total": len(output) + len(errors), "completed": len(output),
+                                     "failed": len(errors)})
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict, headers: dict = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_raw(self) -> bytes:
+                length = int(self.headers.get("content-length") or 0)
+                return self.rfile.read(length)
+
+            def _read_body(self) -> dict:
+                return json.loads(self._read_raw() or b"{}")
+
+            def _not_found(self):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def _upload_file(self):
+                header = f"content-type: {self.headers.get('content-type')}\r\n\r\n".encode("latin-1")
+                message = BytesParser(policy=policy.HTTP).parsebytes(header + self._read_raw())
+                fields, content, filename = {}, b"", "upload"
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    if name == "file":
+                        content = part.get_payload(decode=True)
+                        filename = part.get_filename() or filename
+                    else:
+                        fields[name] = part.get_payload(decode=True).decode("utf-8")
+                self._send_json(200, server._add_file(content, fields.get("purpose"), filename))
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) == 4 and parts[1] == "files" and parts[3] == "content":
+                    file = server.files.get(parts[2])
+                    if file is None:
+                        self._not_found()
+                        return
+                    self.send_response(200)
+                    self.send_header("content-type", "application/octet-stream")
+                    self.send_header("content-length", str(len(file["content"])))
+                    self.end_headers()
+                    self.wfile.write(file["content"])
+                elif len(parts) == 3 and parts[1] == "batches":
+                    batch = server._get_batch(parts[2])
+                    if batch is None:
+                        self._not_found()
+                    else:
+                        self._send_json(200, batch)
+                else:
+                    self._not_found()
+
+            def do_POST(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[-1] == "files":
+                    self._upload_file()
+                    return
+                if parts[-1] == "batches":
+                    self._send_json(200, server._create_batch(self._read_body()))
+                    return
+                if len(parts) >= 3 and parts[-3] == "batches" and parts[-1] == "cancel":
+                    with server._lock:
+                        batch = server.batches.get(parts[-2])
+                        if batch is not None and batch["status"] == "in_progress":
+                            batch["status"] = "cancelled"
+                    batch = server._get_batch(parts[-2])
+                    if batch is None:
+                        self._not_found()
+                    else:
+                        self._send_json(200, batch)
+                    return
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._not_found()
+                    return
+                body = self._read_body()
+                delay, fail, content = server._next_call()
+                time.sleep(delay)
+
+                if fail:
+                    self._send_json(server.error_status,
+                                    {"error": {"message": "Injected failure", "type": "fake_error"}},
+                                    {"retry-after": "0"})
+                    return
+
+                if body.get("stream"):
+                    self._stream(body.get("model", "fake-model"), content)
+                    return
+                self._send_json(200, server._completion(body, content))
+
+            def _stream(self, model: str, content: str):
+                self.send_response(200)
+                self.send_header("content-type", "text/event-stream")
+                self.send_header("connection", "close")
+                self.end_headers()
+                for start in range(0, len(content), server.chunk_size):
+                    event = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + server.chunk_size]},
+                                     "finish_reason": None}]
+                    }
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter added to the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--responses", help="JSON file with a list of canned response objects")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--batch-latency", type=float, default=0.0, help="Seconds until a batch job completes")
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            responses = json.load(f)
+
+    server = FakeLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                           args.error_status, responses, seed=args.seed, batch_latency=args.batch_latency)
+    print(f"Fake LLM server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
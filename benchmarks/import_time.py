@@ -0,0 +1,114 @@
+"""
+Import-time budget check.
+
+Imports a module in fresh interpreters, reports the median wall time and the
+slowest imports (from `python -X importtime`), and fails when the median
+exceeds the budget, when a heavy dependency is loaded eagerly, or when the
+import leaves files behind (such as a logs/ directory):
+
+    python benchmarks/import_time.py --budget-ms 250
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULE = "agentnexus.agents.developer_agent"
+
+# Dependencies that must only load on first use
+LAZY_MODULES = ["black", "isort", "openai", "httpx", "flake8", "sqlite3", "http.server"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # Measure the working tree rather than an installed copy
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(ROOT, "src"), env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure(module: str, runs: int) -> dict:
+    probe = PROBE.format(module=module, lazy=LAZY_MODULES)
+    timings, loaded, side_effects = [], set(), set()
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run([sys.executable, "-c", probe], cwd=workdir, env=_env(),
+                                    capture_output=True, text=True, check=True)
+            side_effects.update(os.listdir(workdir))
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(sample["seconds"])
+        loaded.update(sample["loaded"])
+    return {"timings": timings, "loaded": sorted(loaded), "side_effects": sorted(side_effects)}
+
+
+def slowest_imports(module: str, limit: int) -> list:
+    """Returns (cumulative microseconds, module) for the slowest imports, via -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=tempfile.gettempdir(), env=_env(), capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            entries.append((int(cumulative), name))
+    entries.sort(reverse=True)
+    return entries[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import-time budget of an agentnexus module")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first run does not pay for compilation
+    measure(args.module, 1)
+    result = measure(args.module, args.runs)
+    median_ms = statistics.median(result["timings"]) * 1000
+
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print("\nSlowest imports (cumulative ms):")
+    for cumulative, name in slowest_imports(args.module, args.top):
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if result["loaded"]:
+        failures.append(f"heavy dependencies imported eagerly: {', '.join(result['loaded'])}")
+    if result["side_effects"]:
+        failures.append(f"import created files: {', '.join(result['side_effects'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "median_ms": median_ms, "budget_ms": args.budget_ms,
+                       "timings": result["timings"], "eager_dependencies": result["loaded"],
+                       "side_effects": result["side_effects"], "failures": failures}, f, indent=2)
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Offline benchmark suite.
+
+Starts the fake LLM server, points ConfigManager at it and drives each stage
+of the framework, reporting throughput, p50/p95/p99 latency, CPU time and
+RSS per stage. Results are written as JSON so runs can be compared across
+commits:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Benchmark the working tree, not whatever release happens to be installed
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm_server import FakeLLMServer  # noqa: E402
+
+STAGES = ["code_validator", "execution_engine", "developer_agent", "developer_agent_async",
+          "custom_agent", "pipeline", "pipeline_async"]
+
+SYSTEM_PROMPT = 'Reply with JSON only: {"content_type": "code" or "content", "response": "<code or text>"}'
+
+TASK = "Write a function that returns the n-th Fibonacci number and print fib(30)"
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def current_rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def cpu_seconds() -> dict:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"process": own.ru_utime + own.ru_stime, "children": children.ru_utime + children.ru_stime}
+
+
+class StageRecorder:
+    """Collects latencies and resource usage for one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+
+    def __enter__(self):
+        self.cpu_before = cpu_seconds()
+        self.rss_before = current_rss_kb()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall = time.perf_counter() - self.started
+        cpu_after = cpu_seconds()
+        self.cpu = {key: cpu_after[key] - self.cpu_before[key] for key in cpu_after}
+        self.rss_after = current_rss_kb()
+
+    def observe(self, latency: float, ok: bool):
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "operations": count,
+            "errors": self.errors,
+            "wall_time": self.wall,
+            "throughput": count / self.wall if self.wall else None,
+            "latency": {
+                "mean": sum(latencies) / count if count else None,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": latencies[-1] if latencies else None
+            },
+            "cpu_time": self.cpu,
+            "rss_kb": {"before": self.rss_before, "after": self.rss_after,
+                       "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+        }
+
+
+def _succeeded(output) -> bool:
+    if isinstance(output, dict):
+        if "status" in output:
+            return output["status"] == "success"
+        if "execution_success" in output:
+            return output["execution_success"]
+        if "is_valid" in output:
+            return True
+        return all(_succeeded(value) for value in output.values())
+    return output is not None
+
+
+def run_sync(name: str, operation, iterations: int, concurrency: int) -> dict:
+    recorder = StageRecorder(name)
+
+    def _timed(index):
+        started = time.perf_counter()
+        try:
+            ok = _succeeded(operation(index))
+        except Exception:
+            ok = False
+        recorder.observe(time.perf_counter() - started, ok)
+
+    with recorder:
+        if concurrency <= 1:
+            for index in range(iterations):
+                _timed(index)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(_timed, range(iterations)))
+    return recorder.summary()
+
+
+def run_async(name: str, operation, iterations: int, concurrency: int) -> dict:
+    recorder = StageRecorder(name)
+
+    async def _main():
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _timed(index):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    ok = _succeeded(await operation(index))
+                except Exception:
+                    ok = False
+                recorder.observe(time.perf_counter() - started, ok)
+
+        await asyncio.gather(*(_timed(index) for index in range(iterations)))
+
+        from agentnexus.core.llm_handler import LLMHandler
+        await LLMHandler.aclose()
+
+    with recorder:
+        asyncio.run(_main())
+    return recorder.summary()
+
+
+def build_stages(args) -> dict:
+    """Returns {stage name: callable returning that stage's summary}."""
+    from agentnexus.agents.custom_agent import UserCustomAgent
+    from agentnexus.agents.developer_agent import DeveloperAgent
+    from agentnexus.core.agent_manager import AgentManager
+    from agentnexus.core.agent_manager_pipeline import AgentManagerPipeline
+    from agentnexus.core.execution_engine import ExecutionEngine
+    from agentnexus.core.validation import CodeValidator
+
+    developer = DeveloperAgent.get_instance()
+    custom = UserCustomAgent("custom", SYSTEM_PROMPT, None)
+    engine = ExecutionEngine.get_instance()
+    snippet = "total = sum(i * i for i in range(10000))\nprint(total)\n"
+
+    def _validate(index):
+        # A distinct snippet per call so the validation cache does not hide the linter cost
+        return CodeValidator.validate_python(f"{snippet}value_{index} = {index}\n")
+
+    manager = AgentManager()
+    pipeline = AgentManagerPipeline()
+    for target in (manager, pipeline):
+        target.register_agent("developer", developer)
+        target.register_agent("custom", custom)
+    sequence = ["developer", "custom"]
+
+    n, c = args.iterations, args.concurrency
+    return {
+        "code_validator": lambda: run_sync("code_validator", _validate, n, 1),
+        "execution_engine": lambda: run_sync("execution_engine", lambda i: engine.execute_python(snippet), n, c),
+        "developer_agent": lambda: run_sync("developer_agent", lambda i: developer.execute(f"{TASK} #{i}"), n, c),
+        "developer_agent_async": lambda: run_async("developer_agent_async",
+                                                   lambda i: developer.aexecute(f"{TASK} #{i}"), n, c),
+        "custom_agent": lambda: run_sync("custom_agent", lambda i: custom.execute(f"{TASK} #{i}"), n, c),
+        "pipeline": lambda: run_sync("pipeline", lambda i: manager.run_pipeline(sequence, f"{TASK} #{i}"), n, c),
+        "pipeline_async": lambda: run_async("pipeline_async",
+                                            lambda i: pipeline.run_pipeline_async(sequence, f"{TASK} #{i}"), n, c),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Prints per-stage changes against a baseline run and returns the regressed stages."""
+    regressions = []
+    print(f"\nComparison with {baseline['meta'].get('revision')} (threshold {threshold:.0%})")
+    for name, stage in results["stages"].items():
+        previous = baseline["stages"].get(name)
+        if not previous or not previous["throughput"] or not previous["latency"]["p50"]:
+            continue
+        throughput = stage["throughput"] / previous["throughput"] - 1
+        p95 = stage["latency"]["p95"] / previous["latency"]["p95"] - 1
+        flag = ""
+        if throughput < -threshold or p95 > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<24} throughput {throughput:+7.1%}   p95 {p95:+7.1%}{flag}")
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"\n{'stage':<24} {'ops':>5} {'err':>4} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'cpu s':>7} {'rss MB':>8}")
+    for name, stage in results["stages"].items():
+        latency = stage["latency"]
+        cpu = stage["cpu_time"]["process"] + stage["cpu_time"]["children"]
+        print(f"{name:<24} {stage['operations']:>5} {stage['errors']:>4} {stage['throughput']:>9.1f} "
+              f"{latency['p50'] * 1000:>9.1f} {latency['p95'] * 1000:>9.1f} {latency['p99'] * 1000:>9.1f} "
+              f"{cpu:>7.2f} {stage['rss_kb']['after'] / 1024:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline AgentNexus benchmarks")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as a regression")
+    parser.add_argument("--log", action="store_true", help="Keep framework logging enabled")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           seed=args.seed).start()
+    try:
+        # Configuration must be in place before any agent builds its LLM client
+        from agentnexus.core.config_manager import ConfigManager
+        ConfigManager.set_config(api_key="fake-key", endpoint=server.url, model_name="fake-model",
+                                 enable_logging=args.log)
+
+        stages = build_stages(args)
+        results = {
+            "meta": {
+                "revision": git_revision(),
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "iterations": args.iterations,
+                "concurrency": args.concurrency,
+                "fake_llm": {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate}
+            },
+            "stages": {}
+        }
+        for name in args.stages:
+            print(f"Running {name}...", file=sys.stderr)
+            results["stages"][name] = stages[name]()
+        results["meta"]["fake_llm"].update(server.stats())
+    finally:
+        server.stop()
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
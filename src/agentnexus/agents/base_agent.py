@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import uuid
 
 from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.task_history import TaskHistory
 
 class BaseAgent(ABC):
     """Abstract base class for all agents with automatic logging control."""
@@ -10,7 +11,8 @@ class BaseAgent(ABC):
         self.name = name
         self.agent_id = str(uuid.uuid4())
         self.logger = LoggerManager.get_logger(self.name)  
-        self.task_history = []
+        # Per-agent history stays in memory; AgentManager owns the on-disk log
+        self.task_history = TaskHistory.from_config(persistent=False)
 
 
     @abstractmethod
@@ -30,11 +32,9 @@ class BaseAgent(ABC):
         return True
     
     def log_task(self, task: str, output: dict):
-        self.task_history.append({
-            "task": task,
-            "output": output
-        })
-        self.logger.info(f"Task executed: {task} | Output: {output}")
+        self.task_history.record(self.name, task, output)
+        self.logger.info("Task executed: %s | Output: %s", task, output)
 
-    def get_task_history(self):
-        return self.task_history
+    def get_task_history(self, page_size: int = 100, **filters):
+        """Yields pages of task records; filters are status, since and until."""
+        return self.task_history.pages(page_size, **filters)
@@ -2,6 +2,8 @@ from agentnexus.agents.base_agent import BaseAgent
 from agentnexus.core.llm_handler import LLMHandler
 from agentnexus.core.execution_engine import ExecutionEngine
 from agentnexus.core.validation import CodeValidator
+from agentnexus.core.metrics import Metrics
+import asyncio
 import json
 
 class UserCustomAgent(BaseAgent):
@@ -16,49 +18,70 @@ class UserCustomAgent(BaseAgent):
         self.system_prompt = system_prompt
         self.user_prompt = user_prompt
         self.llm_handler = LLMHandler.get_instance()
-        self.execution_engine = ExecutionEngine()
+        self.execution_engine = ExecutionEngine.get_instance()
         self.temperature = temperature
         self.model_name = model_name
+        self.metrics = Metrics.get_instance()
 
     def execute(self, task: str) -> dict:
-        self.logger.info(f"[UserCustomAgent] Executing Task: {task}")
+        self.logger.info("[UserCustomAgent] Executing Task: %s", task)
         try:
-            llm_raw_response = self.llm_handler.generate_code(
-                system_prompt=self.system_prompt,
-                prompt=self.user_prompt or task,
-                temperature=self.temperature,
-                model_name=self.model_name
-            )
+            with self.metrics.timer("llm", agent=self.name):
+                llm_raw_response = self.llm_handler.generate(
+                    system_prompt=self.system_prompt,
+                    prompt=self.user_prompt or task,
+                    temperature=self.temperature,
+                    model_name=self.model_name
+                )
+            return self._process_response(task, llm_raw_response)
 
-            # Expect LLM to return JSON with 'content_type' and 'response'
-            import json
-            llm_json = json.loads(llm_raw_response)
+        except Exception as e:
+            self.logger.error(f"[UserCustomAgent] Error: {e}", exc_info=True)
+            return {"status": "error", "result": str(e)}
+
+    async def aexecute(self, task: str) -> dict:
+        """Async variant of execute; validation and execution run off the event loop."""
+        self.logger.info("[UserCustomAgent] Executing Task: %s", task)
+        try:
+            with self.metrics.timer("llm", agent=self.name):
+                llm_raw_response = await self.llm_handler.agenerate(
+                    system_prompt=self.system_prompt,
+                    prompt=self.user_prompt or task,
+                    temperature=self.temperature,
+                    model_name=self.model_name
+                )
+            return await asyncio.to_thread(self._process_response, task, llm_raw_response)
+
+        except Exception as e:
+            self.logger.error(f"[UserCustomAgent] Error: {e}", exc_info=True)
+            return {"status": "error", "result": str(e)}
 
-            content_type = llm_json.get("content_type", "content")
-            response_text = llm_json.get("response", "")
+    def _process_response(self, task: str, llm_raw_response: str) -> dict:
+        # Expect LLM to return JSON with 'content_type' and 'response'
+        with self.metrics.timer("parse", agent=self.name):
+            llm_json = json.loads(llm_raw_response)
 
-            result_payload = {
-                "content_type": content_type,
-                "response": response_text
-            }
+        content_type = llm_json.get("content_type", "content")
+        response_text = llm_json.get("response", "")
 
-            # Only run validation & execution if LLM marks this as 'code'
-            if content_type == "code":
-                validation_result = CodeValidator.validate_python(response_text)
-                result_payload["validation"] = validation_result
+        result_payload = {
+            "content_type": content_type,
+            "response": response_text
+        }
 
-                if validation_result.get("is_valid", False):
-                    execution_result = self.execution_engine.execute_python(response_text)
-                    result_payload["execution"] = execution_result
+        # Only run validation & execution if LLM marks this as 'code'
+        if content_type == "code":
+            validation_result = CodeValidator.validate_python(response_text)
+            result_payload["validation"] = validation_result
 
-            output = {"status": "success", "result": result_payload}
+            if validation_result.get("is_valid", False):
+                execution_result = self.execution_engine.execute_python(response_text)
+                result_payload["execution"] = execution_result
 
-            if not self.validate_output(output):
-                return {"status": "error", "result": "Agent output validation failed."}
+        output = {"status": "success", "result": result_payload}
 
-            self.log_task(task, output)
-            return output
+        if not self.validate_output(output):
+            return {"status": "error", "result": "Agent output validation failed."}
 
-        except Exception as e:
-            self.logger.error(f"[UserCustomAgent] Error: {e}", exc_info=True)
-            return {"status": "error", "result": str(e)}
+        self.log_task(task, output)
+        return output
@@ -1,11 +1,17 @@
+import ast
+import asyncio
 import re
-import black
-import isort
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from agentnexus.agents.base_agent import BaseAgent
+from agentnexus.core.config_manager import ConfigManager
 from agentnexus.core.llm_handler import LLMHandler
 from agentnexus.core.validation import CodeValidator
 from agentnexus.core.execution_engine import ExecutionEngine
+from agentnexus.core.formatting_service import FormattingService
+from agentnexus.core.metrics import Metrics
+from agentnexus.core.stream_parser import IncrementalJSONParser, IncrementalSyntaxCheck
 from agentnexus.prompts.developer_prompt import DEVELOPER_PROMPT
 
 class DeveloperAgent(BaseAgent):
@@ -13,10 +19,26 @@ class DeveloperAgent(BaseAgent):
 
     _instance = None  
 
+    # Runs best-of-N candidates for synchronous callers; shared by every instance
+    _candidate_executor = None
+    _candidate_executor_lock = threading.Lock()
+
+    REPAIR_PROMPT = (
+        "The program above was rejected:\n{problems}\n\n"
+        "Return the complete corrected program in the same JSON format."
+    )
+
     def __init__(self):
         super().__init__("DeveloperAgent")
-        self.llm_handler = LLMHandler()
-        self.execution_engine = ExecutionEngine()
+        # Shared so that every instance (e.g. in an AgentPool) reuses one client and connection pool
+        self.llm_handler = LLMHandler.get_instance()
+        self.execution_engine = ExecutionEngine.get_instance()
+        self.metrics = Metrics.get_instance()
+        config = ConfigManager.get_config()
+        self.best_of_n = config["best_of_n"]
+        self.best_of_temperature = config["best_of_temperature"]
+        self.best_of_execute = config["best_of_execute"]
+        self.max_repair_rounds = config["max_repair_rounds"]
 
     @classmethod
     def get_instance(cls):
@@ -37,49 +59,362 @@ class DeveloperAgent(BaseAgent):
 
     def execute(self, task: str) -> dict:
         """Implements the abstract method from BaseAgent."""
+        if self.best_of_n > 1:
+            return self.build_best_of(task)
         return self._build(task)
 
+    def stream(self, task: str, on_chunk=None) -> dict:
+        """
+        Streaming variant of execute. `on_chunk` receives the generated code
+        incrementally; non-code responses are aborted as soon as detected.
+        """
+        return self._build_stream(task, on_chunk)
+
+    async def aexecute(self, task: str) -> dict:
+        """Async variant of execute that awaits the LLM call instead of blocking a thread."""
+        if self.best_of_n > 1:
+            return await self.abuild_best_of(task)
+        return await self._abuild(task)
+
+    def build_best_of(self, task: str, n: int = None, run_code: bool = None, max_repairs: int = None) -> dict:
+        """
+        Requests `n` candidates concurrently and returns the first that passes
+        validation (and, with `run_code`, executes successfully); the others
+        are abandoned: queued ones never start, and running ones stop at
+        their next step (LLM call, formatting, validation, execution). If
+        none passes, the best failure and its diagnostics are sent back for
+        repair, at most `max_repairs` times.
+        """
+        n, run_code, max_repairs = self._best_of_options(n, run_code, max_repairs)
+        self.logger.info("Generating %s candidates for task: %s", n, task)
+        executor = self._get_candidate_executor()
+        prompt, context = task, None
+        attempts, best = 0, None
+
+        for repair_round in range(max_repairs + 1):
+            stop = threading.Event()
+            futures = [executor.submit(self._generate_candidate, prompt, context, run_code, stop) for _ in range(n)]
+            try:
+                for future in as_completed(futures):
+                    attempts += 1
+                    try:
+                        candidate = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Candidate generation failed: {e}")
+                        continue
+                    if candidate["ok"]:
+                        return self._accept_candidate(task, candidate, attempts, repair_round)
+                    best = self._better_candidate(best, candidate)
+            finally:
+                # Queued candidates are dropped; running ones see `stop` and return early
+                stop.set()
+                for future in futures:
+                    future.cancel()
+            if best is None:
+                break
+            prompt, context = self._repair_request(task, best)
+
+        return self._reject_candidates(task, best, attempts)
+
+    async def abuild_best_of(self, task: str, n: int = None, run_code: bool = None,
+                             max_repairs: int = None) -> dict:
+        """Async variant of build_best_of; the losing LLM requests are cancelled."""
+        n, run_code, max_repairs = self._best_of_options(n, run_code, max_repairs)
+        self.logger.info("Generating %s candidates for task: %s", n, task)
+        prompt, context = task, None
+        attempts, best = 0, None
+
+        for repair_round in range(max_repairs + 1):
+            stop = threading.Event()
+            tasks = [asyncio.ensure_future(self._agenerate_candidate(prompt, context, run_code, stop))
+                     for _ in range(n)]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    attempts += 1
+                    try:
+                        candidate = await next_done
+                    except Exception as e:
+                        self.logger.error(f"Candidate generation failed: {e}")
+                        continue
+                    if candidate["ok"]:
+                        return self._accept_candidate(task, candidate, attempts, repair_round)
+                    best = self._better_candidate(best, candidate)
+            finally:
+                # Cancelling stops the LLM requests; evaluation threads see `stop` and return early
+                stop.set()
+                for pending in tasks:
+                    pending.cancel()
+            if best is None:
+                break
+            prompt, context = self._repair_request(task, best)
+
+        return self._reject_candidates(task, best, attempts)
+
+    def _best_of_options(self, n: int, run_code: bool, max_repairs: int):
+        return (max(1, n or self.best_of_n),
+                self.best_of_execute if run_code is None else run_code,
+                self.max_repair_rounds if max_repairs is None else max_repairs)
+
+    @classmethod
+    def _get_candidate_executor(cls) -> ThreadPoolExecutor:
+        with cls._candidate_executor_lock:
+            if cls._candidate_executor is None:
+                cls._candidate_executor = ThreadPoolExecutor(thread_name_prefix="DeveloperCandidate")
+            return cls._candidate_executor
+
+    @staticmethod
+    def _abandoned(candidate: dict, stop: threading.Event) -> bool:
+        if stop is None or not stop.is_set():
+            return False
+        candidate["problems"].append("Abandoned: another candidate was accepted.")
+        return True
+
+    def _generate_candidate(self, prompt: str, context: list, run_code: bool, stop: threading.Event = None) -> dict:
+        if stop is not None and stop.is_set():
+            return self._evaluate_candidate(None, run_code, stop)
+        with self.metrics.timer("llm", agent=self.name):
+            # Fresh requests: identical prompts must still yield independent samples
+            raw = self.llm_handler.generate(DEVELOPER_PROMPT, prompt, temperature=self.best_of_temperature,
+                                            context=context, fresh=True)
+        return self._evaluate_candidate(raw, run_code, stop)
+
+    async def _agenerate_candidate(self, prompt: str, context: list, run_code: bool,
+                                   stop: threading.Event = None) -> dict:
+        with self.metrics.timer("llm", agent=self.name):
+            raw = await self.llm_handler.agenerate(DEVELOPER_PROMPT, prompt, temperature=self.best_of_temperature,
+                                                   context=context, fresh=True)
+        return await asyncio.to_thread(self._evaluate_candidate, raw, run_code, stop)
+
+    def _evaluate_candidate(self, raw: str, run_code: bool, stop: threading.Event = None) -> dict:
+        """
+        Cleans, formats, validates and optionally runs one candidate; `problems`
+        lists why it failed. Once `stop` is set the remaining steps are skipped.
+        """
+        candidate = {"raw": raw, "code": None, "validation": None, "execution": None, "ok": False, "problems": []}
+        if self._abandoned(candidate, stop):
+            return candidate
+        try:
+            code = self._extract_code(raw)
+        except (ValueError, AttributeError) as e:
+            candidate["problems"].append(f"The response was not in the required JSON format: {e}")
+            return candidate
+        if code is None:
+            candidate["problems"].append("The response was not a code block.")
+            return candidate
+
+        if self._syntax_ok(code):
+            with self.metrics.timer("format", agent=self.name):
+                code = self._format_python_code(code)
+        candidate["code"] = code
+        if self._abandoned(candidate, stop):
+            return candidate
+        validation = candidate["validation"] = CodeValidator.validate_python(code)
+        if not validation.get("is_valid"):
+            for diagnostic in validation.get("diagnostics") or []:
+                candidate["problems"].append(
+                    f"line {diagnostic.get('line')}: {diagnostic.get('code')} {diagnostic.get('message')}"
+                )
+            return candidate
+
+        if run_code:
+            if self._abandoned(candidate, stop):
+                return candidate
+            # `fresh` only applies to sampling: identical code from two samples runs identically, so
+            # execution goes through the execution cache as configured (see set_execution_cache_config)
+            execution = candidate["execution"] = self.execution_engine.execute_python(code)
+            if not execution.get("execution_success"):
+                candidate["problems"].append(
+                    f"Execution failed: {execution.get('error') or execution.get('output') or 'non-zero exit status'}"
+                )
+                return candidate
+        candidate["ok"] = True
+        return candidate
+
+    @staticmethod
+    def _better_candidate(best: dict, candidate: dict) -> dict:
+        """Keeps the candidate closest to passing: code beats no code, then fewer problems."""
+        def rank(item):
+            return (item["code"] is None, len(item["problems"]))
+        return candidate if best is None or rank(candidate) < rank(best) else best
+
+    def _repair_request(self, task: str, candidate: dict):
+        """Prompt and context asking the model to fix `candidate`; the system prompt prefix stays unchanged."""
+        problems = "\n".join(f"- {problem}" for problem in candidate["problems"][:20])
+        context = [{"role": "user", "content": task}, {"role": "assistant", "content": candidate["raw"]}]
+        return self.REPAIR_PROMPT.format(problems=problems), context
+
+    def _accept_candidate(self, task: str, candidate: dict, attempts: int, repair_round: int) -> dict:
+        self.metrics.inc("agentnexus_best_of_attempts_total", attempts, agent=self.name, outcome="valid")
+        self.logger.info("Valid candidate after %s attempts (%s repair rounds)", attempts, repair_round)
+        result = {
+            "task": task,
+            "generated_code": candidate["code"],
+            "validation": candidate["validation"],
+            "attempts": attempts,
+            "repair_rounds": repair_round
+        }
+        if candidate["execution"] is not None:
+            result["execution"] = candidate["execution"]
+        output = {"status": "success", "result": result}
+
+        if not self.validate_output(output):
+            return {"status": "error",
+                    "result": {
+                        "task": task,
+                        "error": "Output validation failed."
+                }
+            }
+        self.log_task(task, output)
+        return output
+
+    def _reject_candidates(self, task: str, best: dict, attempts: int) -> dict:
+        self.metrics.inc("agentnexus_best_of_attempts_total", attempts, agent=self.name, outcome="invalid")
+        self.logger.error(f"No valid candidate after {attempts} attempts")
+        result = {
+            "task": task,
+            "error": f"No valid candidate after {attempts} attempts.",
+            "attempts": attempts
+        }
+        if best is not None:
+            result.update(generated_code=best["code"], problems=best["problems"])
+        return {"status": "error", "result": result}
+
     def _build(self, task: str) -> dict:
         """Runs the agent to generate, validate, and execute code."""
-        self.logger.info(f"Generating code for task: {task}")
+        self.logger.info("Generating code for task: %s", task)
         
         try:
-            generated_code = self.llm_handler.generate(DEVELOPER_PROMPT, task)
-            generated_code = json.loads(generated_code)
-            if isinstance (generated_code, dict):
-                if generated_code.get("content_type") == "code":
-                    clean_code = self._clean_python_code(generated_code.get("response"))
-                    formatted_code = self._format_python_code(clean_code)
-                    validation = CodeValidator.validate_python(formatted_code)
-
-                    output = {
-                        "status": "success",
-                        "result" : {
-                            "task": task,
-                            "generated_code": formatted_code,
-                            "validation": validation
-                        }
-                    }
+            with self.metrics.timer("llm", agent=self.name):
+                generated_code = self.llm_handler.generate(DEVELOPER_PROMPT, task)
+            return self._process_generated(task, generated_code)
+
+        except Exception as e:
+            self.logger.error(f"Error in DeveloperAgent execution: {e}", exc_info=True)
+            return {"status": "error", "result": str(e)}
+
+    async def _abuild(self, task: str) -> dict:
+        """Async variant of _build; post-processing runs off the event loop."""
+        self.logger.info("Generating code for task: %s", task)
 
-                    if not self.validate_output(output):
-                        return {"status": "error", 
+        try:
+            with self.metrics.timer("llm", agent=self.name):
+                generated_code = await self.llm_handler.agenerate(DEVELOPER_PROMPT, task)
+            clean_code = self._extract_code(generated_code)
+            if clean_code is None:
+                return None
+            # Formatting runs in the process pool so it does not hold this process's GIL
+            with self.metrics.timer("format", agent=self.name):
+                formatted_code = await FormattingService.get_instance().aformat(clean_code)
+            return await asyncio.to_thread(self._finalize, task, formatted_code)
+
+        except Exception as e:
+            self.logger.error(f"Error in DeveloperAgent execution: {e}", exc_info=True)
+            return {"status": "error", "result": str(e)}
+
+    def _build_stream(self, task: str, on_chunk=None) -> dict:
+        """Streams the LLM response and starts post-processing as soon as the code is complete."""
+        self.logger.info("Streaming code for task: %s", task)
+
+        parser = IncrementalJSONParser()
+        syntax = IncrementalSyntaxCheck()
+        raw_parts = []
+        stream = self.llm_handler.generate_stream(DEVELOPER_PROMPT, task)
+        try:
+            for chunk in stream:
+                raw_parts.append(chunk)
+                for key, delta, complete in parser.feed(chunk):
+                    if key == "content_type" and complete and parser.fields[key] != "code":
+                        self.logger.error("The generated content is not a code block")
+                        return {"status": "error",
                                 "result": {
-                                    "task": task, 
-                                    "error": "Output validation failed."
+                                    "task": task,
+                                    "error": "The generated content is not a code block."
                             }
                         }
-                    self.log_task(task, output)
-                    return output
-        
-                else:
-                    self.logger.error("The generated content is not a code block")
-            else:
-                self.logger.error("The generated LLM output is not in the required format")
+                    if key == "response" and delta:
+                        if not syntax.failed and syntax.feed(delta):
+                            self.logger.info("Syntax pre-check failed while streaming (%s); formatting will be skipped",
+                                             syntax.error)
+                        if on_chunk:
+                            on_chunk(delta)
+
+                # Stop reading once everything needed downstream has arrived
+                if parser.is_complete("response") and parser.is_complete("content_type"):
+                    break
+
+            if not (parser.is_complete("response") and parser.is_complete("content_type")):
+                return self._process_generated(task, "".join(raw_parts))
+
+            clean_code = self._clean_python_code(parser.fields["response"])
+            syntax_ok = not syntax.failed and self._syntax_ok(clean_code)
+            return self._process_code(task, clean_code, syntax_ok=syntax_ok)
 
         except Exception as e:
             self.logger.error(f"Error in DeveloperAgent execution: {e}", exc_info=True)
             return {"status": "error", "result": str(e)}
 
+        finally:
+            stream.close()
+
+    def _process_generated(self, task: str, generated_code: str) -> dict:
+        """Parses the raw LLM response, then cleans, formats and validates the code."""
+        clean_code = self._extract_code(generated_code)
+        if clean_code is None:
+            return None
+        return self._process_code(task, clean_code)
+
+    def _extract_code(self, generated_code: str) -> str:
+        """Returns the cleaned code from the raw LLM response, or None if it is not a code block."""
+        with self.metrics.timer("parse", agent=self.name):
+            generated_code = json.loads(generated_code)
+        if isinstance (generated_code, dict):
+            if generated_code.get("content_type") == "code":
+                return self._clean_python_code(generated_code.get("response"))
+            else:
+                self.logger.error("The generated content is not a code block")
+        else:
+            self.logger.error("The generated LLM output is not in the required format")
+        return None
+
+    def _process_code(self, task: str, clean_code: str, syntax_ok: bool = True) -> dict:
+        # Code that does not parse is not worth formatting; validation reports the error
+        if syntax_ok:
+            with self.metrics.timer("format", agent=self.name):
+                formatted_code = self._format_python_code(clean_code)
+        else:
+            formatted_code = clean_code
+        return self._finalize(task, formatted_code)
+
+    def _finalize(self, task: str, formatted_code: str) -> dict:
+        validation = CodeValidator.validate_python(formatted_code)
+
+        output = {
+            "status": "success",
+            "result" : {
+                "task": task,
+                "generated_code": formatted_code,
+                "validation": validation
+            }
+        }
+
+        if not self.validate_output(output):
+            return {"status": "error", 
+                    "result": {
+                        "task": task, 
+                        "error": "Output validation failed."
+                }
+            }
+        self.log_task(task, output)
+        return output
+
+    @staticmethod
+    def _syntax_ok(code: str) -> bool:
+        try:
+            ast.parse(code)
+            return True
+        except SyntaxError:
+            return False
+
     @staticmethod
     def _clean_python_code(code: str) -> str:
         """Cleans the code by removing Markdown formatting."""
@@ -91,12 +426,7 @@ class DeveloperAgent(BaseAgent):
     @staticmethod
     def _format_python_code(code: str) -> str:
         """Formats code using Black and sorts imports using isort."""
-        try:
-            formatted_code = black.format_str(code, mode=black.FileMode())
-            formatted_code = isort.code(formatted_code)
-            return formatted_code
-        except Exception:
-            return code  
+        return FormattingService.get_instance().format(code)
 
     def _execute_code(self, code: str) -> dict:
         """Executes the Python code using the framework's execution engine."""
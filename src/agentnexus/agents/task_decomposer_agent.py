@@ -1,32 +1,41 @@
+import threading
+
 from agentnexus.agents.base_agent import BaseAgent
+from agentnexus.core.task_router import TaskRouter
 
 class TaskDecomposerAgent(BaseAgent):
     """Decomposes a user task into required agent sequence."""
 
-    def execute(self, task: str) -> dict:
-        self.logger.info(f"Decomposing Task: {task}")
-
-        # Simple rule-based decomposition for now (MVP logic)
-        agent_sequence = []
+    # One router (and plan cache) shared by every instance, e.g. in an AgentPool
+    _router = None
+    _router_lock = threading.Lock()
 
-        if "build" in task.lower() or "create" in task.lower():
-            agent_sequence.append("developer")
-            agent_sequence.append("validator")
-            agent_sequence.append("tester")
-            agent_sequence.append("auditor")
+    @classmethod
+    def get_router(cls) -> TaskRouter:
+        with cls._router_lock:
+            if cls._router is None:
+                cls._router = TaskRouter()
+            return cls._router
 
-        elif "test" in task.lower():
-            agent_sequence.append("tester")
-            agent_sequence.append("auditor")
+    @classmethod
+    def set_router(cls, router: TaskRouter):
+        """Replaces the shared router, e.g. with one trained via TaskRouter.fit."""
+        with cls._router_lock:
+            cls._router = router
 
-        else:
-            agent_sequence.append("developer")
-            agent_sequence.append("validator")
+    def execute(self, task: str) -> dict:
+        self.logger.info("Decomposing Task: %s", task)
 
         result = {
             "status": "success",
-            "result": agent_sequence
+            "result": self.get_router().plan(task)
         }
 
-        self.logger.info(f"Decomposition Result: {result}")
+        self.logger.info("Decomposition Result: %s", result)
         return result
+
+    def decompose_many(self, tasks: list) -> list:
+        """Decomposes a batch of tasks in one routing pass; returns one result per task, in order."""
+        plans = self.get_router().plan_many(tasks)
+        self.logger.info("Decomposed %s tasks", len(plans))
+        return [{"status": "success", "result": plan} for plan in plans]
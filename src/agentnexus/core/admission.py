@@ -0,0 +1,247 @@
+import asyncio
+import time
+from collections import deque
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.metrics import Metrics
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not queued (the queue is full) or is displaced by higher-priority work."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes; queued requests past their deadline never start."""
+
+
+class _Request:
+    __slots__ = ("func", "args", "priority", "tenant", "deadline", "future", "enqueued_at", "task", "timer")
+
+    def __init__(self, func, args: tuple, priority: str, tenant: str, deadline: float, future):
+        self.func = func
+        self.args = args
+        self.priority = priority
+        self.tenant = tenant
+        self.deadline = deadline
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.task = None
+        self.timer = None
+
+
+class AdmissionController:
+    """
+    Bounded admission queue in front of async work.
+
+    At most `max_concurrency` requests run at once; the rest wait in a queue
+    of at most `max_queue` entries. Priority classes are served strictly in
+    order ("interactive" before "default" before "batch"). Within a class,
+    tenants take turns, each getting up to its weight in consecutive slots,
+    so one tenant's burst cannot starve the others. When the queue is full a
+    new request displaces the newest request of a lower class, or is
+    rejected (or, with `block`, waits for room). A request whose deadline
+    passes is dropped from the queue, or cancelled if it is already running.
+
+    Bound to one event loop at a time; it is not thread-safe.
+    """
+
+    PRIORITIES = ("interactive", "default", "batch")
+
+    def __init__(self, max_concurrency: int = None, max_queue: int = None, block: bool = None,
+                 tenant_weights: dict = None, name: str = "pipeline"):
+        config = ConfigManager.get_config()
+        self.max_concurrency = max_concurrency or config["admission_max_concurrency"]
+        self.max_queue = max_queue if max_queue is not None else config["admission_max_queue"]
+        self.block = block if block is not None else config["admission_block"]
+        self.tenant_weights = tenant_weights if tenant_weights is not None else (config["tenant_weights"] or {})
+        self.name = name
+        self.logger = LoggerManager.get_logger("AdmissionController")
+        self.metrics = Metrics.get_instance()
+
+        # priority -> tenant -> deque of requests; dict order is the tenants' round-robin order
+        self._queues = {priority: {} for priority in self.PRIORITIES}
+        self._credits = {}
+        self._space_waiters = deque()
+        self.depth = 0
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+
+    async def submit(self, func, *args, priority: str = "default", tenant: str = "default",
+                     timeout: float = None, deadline: float = None, block: bool = None):
+        """
+        Runs `await func(*args)` once admitted and returns its result.
+        `deadline` is a time.monotonic() timestamp; `timeout` is relative to now.
+        Raises AdmissionRejected or DeadlineExceeded.
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        if timeout is not None:
+            deadline = min(deadline or float("inf"), time.monotonic() + timeout)
+
+        await self._make_room(priority, deadline, self.block if block is None else block)
+
+        loop = asyncio.get_running_loop()
+        request = _Request(func, args, priority, tenant, deadline, loop.create_future())
+        request.future.add_done_callback(lambda future: self._on_done(request))
+        if deadline is not None:
+            request.timer = loop.call_at(loop.time() + max(0.0, deadline - time.monotonic()),
+                                         self._expire, request)
+        self._queues[priority].setdefault(tenant, deque()).append(request)
+        self.depth += 1
+        self._update_depth(priority)
+        self._dispatch()
+        # Cancelling the caller cancels the future, which drops or cancels the request
+        return await request.future
+
+    async def _make_room(self, priority: str, deadline: float, block: bool):
+        while self.depth >= self.max_queue:
+            if self._displace(priority):
+                return
+            if not block:
+                self.rejected += 1
+                self.metrics.inc("agentnexus_admission_rejected_total", priority=priority, reason="full")
+                raise AdmissionRejected(f"Admission queue is full ({self.max_queue} requests)")
+            waiter = asyncio.get_running_loop().create_future()
+            self._space_waiters.append(waiter)
+            try:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                self.expired += 1
+                self.metrics.inc("agentnexus_admission_expired_total", priority=priority, stage="blocked")
+                raise DeadlineExceeded("Deadline passed while waiting for room in the admission queue")
+
+    def _displace(self, priority: str) -> bool:
+        """Rejects the newest queued request of the lowest class below `priority`; True if one was found."""
+        rank = self.PRIORITIES.index(priority)
+        for lower in reversed(self.PRIORITIES[rank + 1:]):
+            tenants = self._queues[lower]
+            if not tenants:
+                continue
+            # Take it from the tenant with the longest backlog
+            tenant = max(tenants, key=lambda name: len(tenants[name]))
+            request = tenants[tenant][-1]
+            self._remove(request)
+            self.rejected += 1
+            self.metrics.inc("agentnexus_admission_rejected_total", priority=lower, reason="displaced")
+            request.future.set_exception(AdmissionRejected(f"Displaced by {priority} work"))
+            return True
+        return False
+
+    def _next(self):
+        """Pops the next request: highest class first, tenants in weighted round-robin."""
+        for priority in self.PRIORITIES:
+            tenants = self._queues[priority]
+            if not tenants:
+                continue
+            tenant = next(iter(tenants))
+            queue = tenants[tenant]
+            request = queue.popleft()
+            credit_key = (priority, tenant)
+            credit = self._credits.get(credit_key, 0) + 1
+            if not queue or credit >= self.tenant_weights.get(tenant, 1):
+                # Turn over: move the tenant to the back of the rotation
+                del tenants[tenant]
+                self._credits.pop(credit_key, None)
+                if queue:
+                    tenants[tenant] = queue
+            else:
+                self._credits[credit_key] = credit
+            self.depth -= 1
+            self._update_depth(priority)
+            self._wake_space()
+            return request
+        return None
+
+    def _remove(self, request: _Request):
+        tenants = self._queues[request.priority]
+        queue = tenants.get(request.tenant)
+        if queue is None or request not in queue:
+            return
+        queue.remove(request)
+        if not queue:
+            del tenants[request.tenant]
+            self._credits.pop((request.priority, request.tenant), None)
+        self.depth -= 1
+        self._update_depth(request.priority)
+        self._wake_space()
+
+    def _wake_space(self):
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _update_depth(self, priority: str):
+        self.metrics.set_gauge("agentnexus_admission_queue_depth",
+                               sum(len(queue) for queue in self._queues[priority].values()),
+                               queue=self.name, priority=priority)
+
+    def _dispatch(self):
+        while self.running < self.max_concurrency:
+            request = self._next()
+            if request is None:
+                return
+            if request.future.done():
+                continue
+            self.admitted += 1
+            self.running += 1
+            self.metrics.set_gauge("agentnexus_admission_running", self.running, queue=self.name)
+            self.metrics.observe("agentnexus_admission_wait_seconds", time.monotonic() - request.enqueued_at,
+                                 queue=self.name, priority=request.priority)
+            request.task = asyncio.ensure_future(self._run(request))
+
+    async def _run(self, request: _Request):
+        try:
+            result = await request.func(*request.args)
+        except asyncio.CancelledError:
+            if not request.future.done():
+                request.future.cancel()
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self.running -= 1
+            self.metrics.set_gauge("agentnexus_admission_running", self.running, queue=self.name)
+            self._dispatch()
+
+    def _expire(self, request: _Request):
+        if request.future.done():
+            return
+        stage = "queued" if request.task is None else "running"
+        self.expired += 1
+        self.metrics.inc("agentnexus_admission_expired_total", priority=request.priority, stage=stage)
+        self.logger.warning("[AdmissionController] Deadline passed for a %s %s request of tenant %s",
+                            stage, request.priority, request.tenant)
+        request.future.set_exception(DeadlineExceeded(f"Deadline passed while {stage}"))
+        self._discard(request)
+
+    def _on_done(self, request: _Request):
+        if request.timer is not None:
+            request.timer.cancel()
+        if request.future.cancelled():
+            self._discard(request)
+
+    def _discard(self, request: _Request):
+        """Stops a request whose caller no longer wants the result."""
+        if request.task is not None:
+            request.task.cancel()
+        else:
+            self._remove(request)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.depth,
+            "running": self.running,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "by_priority": {priority: sum(len(queue) for queue in tenants.values())
+                            for priority, tenants in self._queues.items()}
+        }
@@ -1,14 +1,21 @@
+from agentnexus.core.agent_pool import AgentPool
+from agentnexus.core.pipeline_dag import PipelineDAG, DAGScheduler
+from agentnexus.core.task_history import TaskHistory
+
 class AgentManager:
     def __init__(self):
         self.agents = {}
-        self.task_history = []
+        self.task_history = TaskHistory.from_config()
 
     def register_agent(self, agent_name: str, agent_instance):
         self.agents[agent_name] = agent_instance
 
-    def dynamic_spawn(self, agent_name, agent_class):
+    def dynamic_spawn(self, agent_name, agent_class, pool_size: int = None):
+        """Spawns an agent on first use; with `pool_size`, an AgentPool of up to that many instances."""
         if agent_name not in self.agents:
-            if hasattr(agent_class, 'get_instance'):
+            if pool_size:
+                self.agents[agent_name] = AgentPool.for_class(agent_class, agent_name, size=pool_size)
+            elif hasattr(agent_class, 'get_instance'):
                 self.agents[agent_name] = agent_class.get_instance()
             else:
                 self.agents[agent_name] = agent_class(agent_name)
@@ -26,9 +33,13 @@ class AgentManager:
             return {"status": "error", "result": output}
         
         agent.log_task(task, output)
-        self.task_history.append({"agent": agent_name, "task": task, "output": output})
+        self.task_history.record(agent_name, task, output)
         return output
 
+    def get_task_history(self, page_size: int = 100, **filters):
+        """Yields pages of task records; filters are agent, status, since and until."""
+        return self.task_history.pages(page_size, **filters)
+
     def run_pipeline(self, agent_sequence: list, task: str):
         context = {}
         for agent_name in agent_sequence:
@@ -37,3 +48,7 @@ class AgentManager:
             if result['status'] == 'error':
                 break
         return context
+
+    def run_dag(self, dag: PipelineDAG, task: str, max_workers: int = None, cancel_event=None):
+        """Runs a pipeline DAG, executing independent branches concurrently."""
+        return DAGScheduler(dag).run(task, self.run_task, max_workers=max_workers, cancel_event=cancel_event)
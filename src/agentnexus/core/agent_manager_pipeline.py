@@ -1,14 +1,20 @@
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from agentnexus.core.admission import AdmissionController
 from agentnexus.core.agent_manager import AgentManager
 from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.pipeline_dag import PipelineDAG, DAGScheduler
+from agentnexus.core.single_flight import SingleFlight
 
 class AgentManagerPipeline(AgentManager):
     def __init__(self):
         super().__init__()
         self.executer = ThreadPoolExecutor(max_workers=5)
-        self.active_tasks = set()
+        # Concurrent pipelines running the same agent on the same task share one execution
+        self.active_tasks = SingleFlight()
         self.logger = LoggerManager.get_logger("AgentManagerPipeline")
+        # Bounds how much pipeline work is in flight; see submit()
+        self.admission = AdmissionController()
 
     async def run_task_async(self, agent_name: str, task: str):
         if agent_name not in self.agents:
@@ -16,7 +22,11 @@ class AgentManagerPipeline(AgentManager):
             raise ValueError(f"Agent {agent_name} not found")
         
         agent = self.agents[agent_name]
-        output = await asyncio.get_event_loop().run_in_executor(self.executer, agent.execute, task)
+        if hasattr(agent, "aexecute"):
+            # Native async agents await LLM I/O directly on the event loop
+            output = await agent.aexecute(task)
+        else:
+            output = await asyncio.get_running_loop().run_in_executor(self.executer, agent.execute, task)
 
         if not agent.validate_output(output):
             print(f"[AgentManager] Validation failed for {agent_name}")
@@ -24,29 +34,58 @@ class AgentManagerPipeline(AgentManager):
             return {"status": "error", "result": output}
         
         agent.log_task(task, output)
-        self.task_history.append({"agent": agent_name, "task": task, "output": output})
-        self.logger.info(f"[AgentManagerPipeline] Agent {agent_name} completed execution")
+        self.task_history.record(agent_name, task, output)
+        self.logger.info("[AgentManagerPipeline] Agent %s completed execution", agent_name)
         return output
     
     async def run_pipeline_async(self, agent_sequence: list, task: str):
         context = {}
-        tasks = []
+        # An agent already running this task for another pipeline is awaited, not run twice
+        agent_names = list(dict.fromkeys(agent_sequence))
+        tasks = [
+            asyncio.create_task(self.active_tasks.ado(
+                (agent_name, task), lambda agent_name=agent_name: self.run_task_async(agent_name, task),
+                cancel_orphaned=True
+            ))
+            for agent_name in agent_names
+        ]
 
-        for agent_name in agent_sequence:
-            if self.logger.warning(f"[AgentManagerPipeline] Skipping duplicate agent-task: {agent_name}"):
-                continue
-            self.active_tasks.add((agent_name, task))
-            tasks.append(asyncio.create_task(self.run_task_async(agent_name, task)))
+        self.logger.info("[AgentManagerPipeline] Running pipeline for task: %s", task)
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for pending in tasks:
+                pending.cancel()
+            raise
 
-        self.logger.info(f"[AgentManagerPipeline] Running pipeline for task: {task}")
-        results = await asyncio.gather(*tasks)
-
-        for agent_name, result in zip(agent_sequence, results):
+        for agent_name, result in zip(agent_names, results):
             context[agent_name] = result
 
-        self.logger.info(f"[AgentManagerPipeline] Pipeline completed for task: {task}")
+        self.logger.info("[AgentManagerPipeline] Pipeline completed for task: %s", task)
+        return context
+
+    async def run_dag_async(self, dag: PipelineDAG, task: str, cancel_event: asyncio.Event = None):
+        """Runs a pipeline DAG on the event loop, passing upstream results downstream."""
+        self.logger.info("[AgentManagerPipeline] Running DAG pipeline for task: %s", task)
+        context = await DAGScheduler(dag).arun(task, self.run_task_async, cancel_event=cancel_event)
+        self.logger.info("[AgentManagerPipeline] DAG pipeline completed for task: %s", task)
         return context
 
+    async def submit(self, pipeline, task: str, priority: str = "default", tenant: str = "default",
+                     timeout: float = None, deadline: float = None):
+        """
+        Runs a pipeline (an agent sequence or a PipelineDAG) through admission
+        control and returns its context. `priority` is "interactive", "default"
+        or "batch". Raises AdmissionRejected when the queue is full and
+        DeadlineExceeded when the deadline passes; expired work is cancelled
+        before (or while) it reaches the LLM.
+        """
+        if isinstance(pipeline, PipelineDAG):
+            return await self.admission.submit(self.run_dag_async, pipeline, task, priority=priority,
+                                               tenant=tenant, timeout=timeout, deadline=deadline)
+        return await self.admission.submit(self.run_pipeline_async, pipeline, task, priority=priority,
+                                           tenant=tenant, timeout=timeout, deadline=deadline)
+
     def shutdown(self):
         self.logger.info("[AgentManagerPipeline] Executor shutdown")
         self.executer.shutdown()
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager, contextmanager
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+
+class AgentPool:
+    """
+    Fixed-size pool of instances of one agent class.
+    Instances are built once, on first use or (with `warm_up`) at
+    registration, and handed out with checkout/release, so dispatching a
+    task does not construct an agent.
+    Safe to use from threads and from asyncio at the same time.
+    """
+
+    def __init__(self, factory, size: int = None, warm_up: bool = None, name: str = None):
+        config = ConfigManager.get_config()
+        self.factory = factory
+        self.size = max(1, size or config["agent_pool_size"])
+        self.name = name
+        self.created = 0
+        self.checkouts = 0
+        self.waits = 0
+        self._idle = deque()
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self._primary = None
+
+        if warm_up if warm_up is not None else config["agent_pool_warm_up"]:
+            try:
+                self.warm_up()
+            except Exception as e:
+                # The pool stays usable; instances are built (and failures raised) on first use instead
+                LoggerManager.get_logger("AgentPool").error(
+                    f"[AgentPool] Warm-up of {self.name or self.factory} failed: {e}", exc_info=True)
+
+    @classmethod
+    def for_class(cls, agent_class: type, agent_name: str, size: int = None, warm_up: bool = None):
+        """
+        Pool for `agent_class`, constructed the way AgentManager.dynamic_spawn
+        does: singleton-style classes without arguments, others with the agent name.
+        """
+        if hasattr(agent_class, "get_instance"):
+            factory = agent_class
+        else:
+            def factory():
+                return agent_class(agent_name)
+        return cls(factory, size=size, warm_up=warm_up, name=agent_name)
+
+    def warm_up(self, count: int = None):
+        """Builds idle instances up to `count` (default: the pool size)."""
+        count = min(self.size, count or self.size)
+        while True:
+            with self._lock:
+                if self.created >= count:
+                    return
+                self.created += 1
+            self.release(self._build_reserved())
+
+    def _reserve(self):
+        """Returns (agent, None), (None, None) when a new instance may be built, or (None, waiter)."""
+        with self._lock:
+            self.checkouts += 1
+            if self._idle:
+                return self._idle.popleft(), None
+            if self.created < self.size:
+                # Count the instance now so concurrent callers cannot overshoot the size
+                self.created += 1
+                return None, None
+            self.waits += 1
+            waiter = Future()
+            self._waiters.append(waiter)
+            return None, waiter
+
+    def _build_reserved(self):
+        """Builds an instance whose slot was already counted in `created`."""
+        try:
+            agent = self.factory()
+        except BaseException:
+            with self._lock:
+                self.created -= 1
+            raise
+        with self._lock:
+            if self._primary is None:
+                self._primary = agent
+        return agent
+
+    def checkout(self, timeout: float = None):
+        """Returns an idle instance, building one if the pool is not full, else waits for a release."""
+        agent, waiter = self._reserve()
+        if agent is not None:
+            return agent
+        if waiter is None:
+            return self._build_reserved()
+        try:
+            return waiter.result(timeout)
+        except FutureTimeoutError:
+            if not waiter.cancel():
+                # Released to us just as the wait timed out; hand it back
+                self.release(waiter.result())
+            raise
+
+    async def acheckout(self):
+        """Async checkout; waiting does not block the event loop."""
+        agent, waiter = self._reserve()
+        if agent is not None:
+            return agent
+        if waiter is None:
+            return self._build_reserved()
+        try:
+            return await asyncio.wrap_future(waiter)
+        except asyncio.CancelledError:
+            # The instance may have been handed over just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release(waiter.result())
+            raise
+
+    def release(self, agent):
+        """Returns an instance to the pool, handing it straight to the oldest waiter if any."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.set_running_or_notify_cancel():
+                    waiter.set_result(agent)
+                    return
+            self._idle.append(agent)
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        agent = self.checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    @asynccontextmanager
+    async def alease(self):
+        agent = await self.acheckout()
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def execute(self, task: str) -> dict:
+        with self.lease() as agent:
+            return agent.execute(task)
+
+    async def aexecute(self, task: str) -> dict:
+        async with self.alease() as agent:
+            if hasattr(agent, "aexecute"):
+                return await agent.aexecute(task)
+            return await asyncio.get_running_loop().run_in_executor(None, agent.execute, task)
+
+    def _get_primary(self):
+        """The first instance built, which answers the non-task calls below; built now if there is none yet."""
+        if self._primary is None:
+            with self.lease():
+                pass
+        return self._primary
+
+    # AgentManager treats a pool like a single agent
+    def validate_output(self, output: dict) -> bool:
+        return self._get_primary().validate_output(output)
+
+    def log_task(self, task: str, output: dict):
+        self._get_primary().log_task(task, output)
+
+    def get_task_history(self, page_size: int = 100, **filters):
+        return self._get_primary().get_task_history(page_size, **filters)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self.created,
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+                "checkouts": self.checkouts,
+                "waits": self.waits
+            }
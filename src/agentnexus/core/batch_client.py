@@ -0,0 +1,270 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.metrics import Metrics
+
+class BatchJobError(Exception):
+    """Raised into a request's Future when its provider batch job or the request itself failed."""
+
+
+class LLMBatchClient:
+    """
+    Submits chat-completion requests through the provider batch API
+    (/files + /batches). Requests are buffered, uploaded together as one
+    JSONL batch job, and a background thread polls the jobs and resolves
+    each caller's Future with the completion text.
+    """
+
+    ENDPOINT = "/v1/chat/completions"
+    FAILED_STATUSES = {"failed", "expired", "cancelled"}
+    MAX_READ_ATTEMPTS = 5
+
+    def __init__(self, handler, max_batch_size: int = None, flush_interval: float = None,
+                 poll_interval: float = None, completion_window: str = None):
+        config = ConfigManager.get_config()
+        self.handler = handler
+        self.max_batch_size = max_batch_size or config["batch_max_requests"]
+        self.flush_interval = flush_interval if flush_interval is not None else config["batch_flush_interval"]
+        self.poll_interval = poll_interval if poll_interval is not None else config["batch_poll_interval"]
+        self.completion_window = completion_window or config["batch_completion_window"]
+        self.logger = LoggerManager.get_logger("LLMBatchClient")
+        self.metrics = Metrics.get_instance()
+
+        self._pending = {}
+        self._pending_since = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._poller = None
+        self.submitted_jobs = 0
+        self.submitted_requests = 0
+
+    def submit(self, system_prompt: str, prompt: str, temperature: float = None, model_name: str = None,
+               context: list = None) -> Future:
+        """Queues one request and returns a Future for its completion text."""
+        handler = self.handler
+        model_name, temperature = handler._resolve(temperature, model_name)
+        request_key = handler._request_key(system_prompt, prompt, model_name, temperature, context)
+        cache_key = request_key if handler._cacheable(temperature) else None
+
+        future = Future()
+        cached = handler._from_cache(cache_key)
+        if cached is not None:
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LLMBatchClient is closed")
+            entry = self._pending.get(request_key)
+            if entry is None:
+                # Identical requests in one batch are sent once and share the result
+                body = handler._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+                # Batches go to the primary endpoint; the body is sent as JSON, so extra fields sit at the top level
+                body.update(handler._prompt_cache_fields(handler.router.endpoints[0], body))
+                entry = self._pending[request_key] = {
+                    "body": body,
+                    "cache_key": cache_key,
+                    "futures": []
+                }
+                if self._pending_since is None:
+                    self._pending_since = time.monotonic()
+            entry["futures"].append(future)
+            full = len(self._pending) >= self.max_batch_size
+        self._ensure_poller()
+        if full:
+            self.flush()
+        return future
+
+    def flush(self):
+        """Uploads every buffered request as one batch job; returns the job id (None if nothing was buffered)."""
+        with self._lock:
+            pending, self._pending, self._pending_since = self._pending, {}, None
+        if not pending:
+            return None
+
+        requests = {}
+        lines = []
+        for index, entry in enumerate(pending.values()):
+            custom_id = f"request-{index}"
+            requests[custom_id] = entry
+            lines.append(json.dumps({"custom_id": custom_id, "method": "POST",
+                                     "url": self.ENDPOINT, "body": entry["body"]}))
+
+        try:
+            client = self.handler.client
+            input_file = client.files.create(
+                file=("batch.jsonl", ("\n".join(lines) + "\n").encode("utf-8"), "application/jsonl"),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=self.ENDPOINT,
+                completion_window=self.completion_window
+            )
+        except Exception as e:
+            self.logger.error(f"[LLMBatchClient] Batch submission failed: {e}", exc_info=True)
+            self._fail(requests, BatchJobError(f"Batch submission failed: {e}"))
+            return None
+
+        with self._lock:
+            self._jobs[batch.id] = {"requests": requests, "submitted_at": time.time(),
+                                    "read_files": set(), "read_attempts": 0}
+            self.submitted_jobs += 1
+            self.submitted_requests += len(requests)
+        self.logger.info("[LLMBatchClient] Submitted batch %s with %s requests", batch.id, len(requests))
+        self._wakeup.set()
+        return batch.id
+
+    def _ensure_poller(self):
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, name="LLMBatchPoller", daemon=True)
+                self._poller.start()
+
+    def _poll_loop(self):
+        while True:
+            timeout = self.poll_interval
+            if self.flush_interval:
+                timeout = min(timeout, self.flush_interval)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+            with self._lock:
+                closed = self._closed
+                due = self._pending_since is not None and self.flush_interval and \
+                    time.monotonic() - self._pending_since >= self.flush_interval
+                job_ids = list(self._jobs)
+            if due:
+                self.flush()
+            for batch_id in job_ids:
+                try:
+                    self._poll(batch_id)
+                except Exception as e:
+                    self.logger.error(f"[LLMBatchClient] Polling batch {batch_id} failed: {e}", exc_info=True)
+            with self._lock:
+                if closed and not self._jobs:
+                    self._poller = None
+                    return
+
+    def _poll(self, batch_id: str):
+        batch = self.handler.client.batches.retrieve(batch_id)
+        if batch.status in self.FAILED_STATUSES:
+            with self._lock:
+                job = self._jobs.pop(batch_id)
+            self.logger.error(f"[LLMBatchClient] Batch {batch_id} ended with status {batch.status}")
+            detail = f": {batch.errors}" if batch.errors else ""
+            self._fail(job["requests"], BatchJobError(f"Batch {batch_id} {batch.status}{detail}"))
+            return
+        if batch.status != "completed":
+            return
+
+        # The job stays queued until its files have been read, so a transient read error is retried on the next poll
+        with self._lock:
+            job = self._jobs[batch_id]
+        requests = job["requests"]
+        failure = None
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id or file_id in job["read_files"]:
+                continue
+            try:
+                self._resolve_file(file_id, requests)
+                job["read_files"].add(file_id)
+            except Exception as e:
+                self.logger.error(f"[LLMBatchClient] Reading results file {file_id} of batch {batch_id} "
+                                  f"failed: {e}", exc_info=True)
+                failure = e
+        if failure is not None:
+            job["read_attempts"] += 1
+            if job["read_attempts"] < self.MAX_READ_ATTEMPTS:
+                self.logger.warning("[LLMBatchClient] Will retry reading results of batch %s (attempt %d of %d)",
+                                    batch_id, job["read_attempts"], self.MAX_READ_ATTEMPTS)
+                return
+
+        with self._lock:
+            self._jobs.pop(batch_id, None)
+        # Anything not resolved by now is a failure, not a hang
+        detail = f"results could not be read: {failure}" if failure else "returned no result for the request"
+        self._fail(requests, BatchJobError(f"Batch {batch_id} {detail}"))
+        self.logger.info("[LLMBatchClient] Batch %s completed in %.1fs", batch_id,
+                         time.time() - job["submitted_at"])
+
+    def _resolve_file(self, file_id: str, requests: dict):
+        content = self.handler.client.files.content(file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            # Each line is settled on its own, so one bad entry cannot strand the rest of the batch
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                self.logger.error(f"[LLMBatchClient] Skipping malformed line in results file {file_id}: {e}")
+                continue
+            entry = requests.pop(item.get("custom_id"), None) if isinstance(item, dict) else None
+            if entry is None:
+                continue
+            try:
+                result = self._parse_result(item)
+            except BatchJobError as e:
+                self._settle(entry, exception=e)
+                continue
+            except Exception as e:
+                self._settle(entry, exception=BatchJobError(f"Malformed batch result: {e!r}"))
+                continue
+            self.handler._to_cache(entry["cache_key"], result)
+            self._settle(entry, result=result)
+
+    def _parse_result(self, item: dict) -> str:
+        """Completion text of one results-file entry; raises BatchJobError if the request failed."""
+        response = item.get("response") or {}
+        body = response.get("body") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            error = item.get("error") or body.get("error") or f"status {response.get('status_code')}"
+            raise BatchJobError(f"Batch request failed: {error}")
+        usage = body.get("usage")
+        if usage:
+            self.metrics.record_usage(SimpleNamespace(**usage), model=body.get("model"))
+        return body["choices"][0]["message"]["content"]
+
+    @staticmethod
+    def _settle(entry: dict, result=None, exception: Exception = None):
+        for future in entry["futures"]:
+            if future.set_running_or_notify_cancel():
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(result)
+
+    def _fail(self, requests: dict, exception: Exception):
+        for entry in requests.values():
+            self._settle(entry, exception=exception)
+        requests.clear()
+
+    def poll_now(self):
+        """Wakes the poller instead of waiting for the next poll interval."""
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buffered": len(self._pending),
+                "active_jobs": len(self._jobs),
+                "submitted_jobs": self.submitted_jobs,
+                "submitted_requests": self.submitted_requests
+            }
+
+    def close(self, wait: bool = True):
+        """Flushes buffered requests; with `wait`, blocks until every submitted job has been resolved."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            poller = self._poller
+        self._wakeup.set()
+        if wait and poller is not None:
+            poller.join()
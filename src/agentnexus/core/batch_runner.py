@@ -0,0 +1,265 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED
+
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.pipeline_dag import PipelineDAG
+
+class _JSONLWriter:
+    """Appends one JSON object per line; `position` is the durable byte offset."""
+
+    def __init__(self, path: str, position: int = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if position is None:
+            self._file = open(path, "wb")
+        else:
+            # Drop rows written after the last checkpoint; those tasks will run again
+            self._file = open(path, "r+b" if os.path.exists(path) else "wb")
+            self._file.truncate(position)
+            self._file.seek(position)
+
+    def write(self, row: dict):
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+
+    def position(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """
+    Writes a directory of Parquet part files. Rows are buffered until the
+    next checkpoint, so `position` (the number of parts) is always durable.
+    """
+
+    COLUMNS = ("index", "id", "task", "status", "result", "elapsed")
+
+    def __init__(self, path: str, position: int = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet output requires the 'pyarrow' package")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.parts = position or 0
+        self._rows = []
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            # Parts written after the last checkpoint (or by a previous run) are discarded
+            if name.startswith("part-") and (position is None or int(name[5:10]) >= self.parts):
+                os.remove(os.path.join(path, name))
+
+    def write(self, row: dict):
+        row = dict(row, result=json.dumps(row["result"], ensure_ascii=False, default=str),
+                   id=None if row["id"] is None else str(row["id"]))
+        self._rows.append(row)
+
+    def position(self) -> int:
+        if self._rows:
+            table = self._pa.table({column: [row[column] for row in self._rows] for column in self.COLUMNS})
+            part = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+            self._pq.write_table(table, f"{part}.tmp")
+            os.replace(f"{part}.tmp", part)
+            self.parts += 1
+            self._rows = []
+        return self.parts
+
+    def close(self):
+        self.position()
+
+
+class BatchRunner:
+    """
+    Runs tasks from a JSONL file through an AgentManager at bounded
+    concurrency and streams results to JSONL or Parquet as they complete.
+
+    Each input line is {"task": ..., "id": ..., "agent": ..., "pipeline": [...]};
+    `agent`/`pipeline` fall back to the runner's defaults. Progress is
+    checkpointed as a watermark (every line up to it is done) plus the few
+    completed lines beyond it, so a restarted run skips finished tasks.
+    Memory stays bounded: at most `max_window` lines past the watermark are
+    ever read ahead.
+    """
+
+    def __init__(self, manager, agent: str = None, pipeline: list = None, concurrency: int = 8,
+                 checkpoint_path: str = None, checkpoint_every: int = 100, checkpoint_interval: float = 30.0,
+                 progress_interval: float = 10.0, max_window: int = None):
+        self.manager = manager
+        self.agent = agent
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.progress_interval = progress_interval
+        self.max_window = max_window or concurrency * 100
+        self.logger = LoggerManager.get_logger("BatchRunner")
+
+    def run(self, input_path: str, output_path: str, output_format: str = None) -> dict:
+        """Blocking entry point; see `arun`."""
+        return asyncio.run(self.arun(input_path, output_path, output_format))
+
+    async def arun(self, input_path: str, output_path: str, output_format: str = None) -> dict:
+        """Processes `input_path` and returns run statistics. `output_format` is "jsonl" or "parquet"."""
+        output_format = output_format or ("parquet" if output_path.endswith(".parquet") else "jsonl")
+        if output_format not in ("jsonl", "parquet"):
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        checkpoint = self._load_checkpoint(input_path, output_path)
+        self.watermark = checkpoint["watermark"]
+        self.completed = set(checkpoint["completed"])
+        position = checkpoint["output_position"] if checkpoint["resumed"] else None
+        writer = _JSONLWriter(output_path, position) if output_format == "jsonl" \
+            else _ParquetWriter(output_path, position)
+
+        self.stats = {"done": 0, "failed": 0, "skipped": 0, "started": time.monotonic()}
+        self._since_checkpoint = 0
+        self._last_checkpoint = self._last_progress = time.monotonic()
+        if checkpoint["resumed"]:
+            self.logger.info("[BatchRunner] Resuming %s after line %s", input_path, self.watermark)
+
+        pending = set()
+        try:
+            for index, record in self._read(input_path):
+                while pending and (len(pending) >= self.concurrency or index - self.watermark > self.max_window):
+                    pending = await self._collect(pending, writer, input_path, output_path)
+                pending.add(asyncio.ensure_future(self._run_one(index, record)))
+            while pending:
+                pending = await self._collect(pending, writer, input_path, output_path)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            self._checkpoint(writer, input_path, output_path)
+            writer.close()
+
+        elapsed = time.monotonic() - self.stats.pop("started")
+        self.stats.update(elapsed=elapsed, throughput=self.stats["done"] / elapsed if elapsed else None)
+        self.logger.info("[BatchRunner] Finished %s: %s", input_path, self.stats)
+        return self.stats
+
+    def _read(self, input_path: str):
+        """Yields (line index, record) lazily, skipping lines finished in a previous run."""
+        with open(input_path, encoding="utf-8") as input_file:
+            for index, line in enumerate(input_file):
+                if index <= self.watermark or index in self.completed:
+                    self.stats["skipped"] += 1
+                    continue
+                line = line.strip()
+                if not line:
+                    self._mark_done(index)
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    record = {"error": f"Invalid JSON on line {index + 1}: {e}"}
+                if isinstance(record, str):
+                    record = {"task": record}
+                yield index, record
+
+    async def _run_one(self, index: int, record: dict) -> dict:
+        started = time.perf_counter()
+        task = record.get("task")
+        try:
+            if "error" in record and task is None:
+                raise ValueError(record["error"])
+            pipeline = record.get("pipeline") or self.pipeline
+            agent = record.get("agent") or self.agent
+            if pipeline:
+                result = await self._run_pipeline(pipeline, task)
+                failed = any(isinstance(output, dict) and output.get("status") in ("error", "skipped")
+                             for output in result.values())
+                status = "error" if failed else "success"
+            elif agent:
+                result = await self._run_task(agent, task)
+                status = result.get("status", "error") if isinstance(result, dict) else "error"
+            else:
+                raise ValueError("Task has no agent or pipeline")
+        except Exception as e:
+            status, result = "error", str(e)
+        return {"index": index, "id": record.get("id"), "task": task, "status": status,
+                "result": result, "elapsed": time.perf_counter() - started}
+
+    async def _run_task(self, agent: str, task: str):
+        if hasattr(self.manager, "run_task_async"):
+            return await self.manager.run_task_async(agent, task)
+        return await asyncio.get_running_loop().run_in_executor(None, self.manager.run_task, agent, task)
+
+    async def _run_pipeline(self, pipeline: list, task: str) -> dict:
+        dag = PipelineDAG.from_sequence(pipeline)
+        if hasattr(self.manager, "run_dag_async"):
+            return await self.manager.run_dag_async(dag, task)
+        return await asyncio.get_running_loop().run_in_executor(None, self.manager.run_dag, dag, task)
+
+    async def _collect(self, pending: set, writer, input_path: str, output_path: str) -> set:
+        done, pending = await asyncio.wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            row = future.result()
+            writer.write(row)
+            self.stats["done"] += 1
+            if row["status"] != "success":
+                self.stats["failed"] += 1
+            self._mark_done(row["index"])
+            self._since_checkpoint += 1
+
+        now = time.monotonic()
+        if self._since_checkpoint >= self.checkpoint_every or now - self._last_checkpoint >= self.checkpoint_interval:
+            self._checkpoint(writer, input_path, output_path)
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            elapsed = now - self.stats["started"]
+            self.logger.info("[BatchRunner] %s done (%s failed), %.1f tasks/s, %s in flight",
+                             self.stats["done"], self.stats["failed"],
+                             self.stats["done"] / elapsed if elapsed else 0.0, len(pending))
+        return pending
+
+    def _mark_done(self, index: int):
+        """Advances the watermark over every contiguous finished line."""
+        self.completed.add(index)
+        while self.watermark + 1 in self.completed:
+            self.watermark += 1
+            self.completed.discard(self.watermark)
+
+    def _load_checkpoint(self, input_path: str, output_path: str) -> dict:
+        fresh = {"watermark": -1, "completed": [], "output_position": None, "resumed": False}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return fresh
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input") != os.path.abspath(input_path) or \
+                checkpoint.get("output") != os.path.abspath(output_path):
+            self.logger.warning("[BatchRunner] Checkpoint %s belongs to another run; starting over",
+                                self.checkpoint_path)
+            return fresh
+        return dict(checkpoint, resumed=True)
+
+    def _checkpoint(self, writer, input_path: str, output_path: str):
+        """Makes the output durable, then records how far it goes."""
+        position = writer.position()
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            "input": os.path.abspath(input_path),
+            "output": os.path.abspath(output_path),
+            "watermark": self.watermark,
+            "completed": sorted(self.completed),
+            "output_position": position,
+            "updated_at": time.time()
+        }
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
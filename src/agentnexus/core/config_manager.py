@@ -10,18 +10,276 @@ class ConfigManager:
             cls._instance.temperature = 0.7
             cls._instance.model_provider = "groq"
             cls._instance.enable_logging = True
+            cls._instance.enable_cache = False
+            cls._instance.cache_max_entries = 1024
+            cls._instance.cache_ttl = 3600
+            cls._instance.cache_path = None
+            cls._instance.cache_max_disk_entries = 100000
+            cls._instance.cache_nondeterministic = False
+            cls._instance.max_connections = 100
+            cls._instance.max_keepalive_connections = 20
+            cls._instance.keepalive_expiry = 30.0
+            cls._instance.request_timeout = 60.0
+            cls._instance.requests_per_minute = None
+            cls._instance.tokens_per_minute = None
+            cls._instance.max_concurrency = None
+            cls._instance.initial_concurrency = 16
+            cls._instance.latency_target = None
+            cls._instance.max_retries = 5
+            cls._instance.retry_base_delay = 0.5
+            cls._instance.retry_max_delay = 30.0
+            cls._instance.use_worker_pool = False
+            cls._instance.pool_size = 2
+            cls._instance.preload_modules = ()
+            cls._instance.execution_timeout = 60.0
+            cls._instance.memory_limit_mb = None
+            cls._instance.max_runs_per_worker = 100
+            cls._instance.max_parallel_executions = None
+            cls._instance.formatter_workers = None
+            cls._instance.line_length = 88
+            cls._instance.isort_profile = None
+            cls._instance.queue_logging = False
+            cls._instance.max_payload_chars = 10000
+            cls._instance.log_max_bytes = None
+            cls._instance.log_backup_count = 5
+            cls._instance.log_queue_size = 10000
+            cls._instance.history_capacity = 1000
+            cls._instance.history_path = None
+            cls._instance.history_backend = None
+            cls._instance.compress_threshold = 65536
+            cls._instance.compression = "auto"
+            cls._instance.enable_metrics = False
+            cls._instance.metrics_port = None
+            cls._instance.enable_tracing = False
+            cls._instance.agent_pool_size = 4
+            cls._instance.agent_pool_warm_up = False
+            cls._instance.batch_max_requests = 1000
+            cls._instance.batch_flush_interval = 60.0
+            cls._instance.batch_poll_interval = 30.0
+            cls._instance.batch_completion_window = "24h"
+            cls._instance.max_prompt_tokens = None
+            cls._instance.tokenizer_encoding = "cl100k_base"
+            cls._instance.prompt_cache_key = False
+            cls._instance.router_cache_size = 4096
+            cls._instance.router_min_confidence = 0.6
+            cls._instance.admission_max_concurrency = 8
+            cls._instance.admission_max_queue = 1000
+            cls._instance.admission_block = False
+            cls._instance.tenant_weights = None
+            cls._instance.endpoints = None
+            cls._instance.enable_hedging = False
+            cls._instance.hedge_percentile = 0.95
+            cls._instance.hedge_initial_delay = 2.0
+            cls._instance.hedge_min_delay = 0.05
+            cls._instance.hedge_max_delay = 10.0
+            cls._instance.failover_cooldown = 30.0
+            cls._instance.hedge_max_workers = 64
+            cls._instance.best_of_n = 1
+            cls._instance.best_of_temperature = 0.8
+            cls._instance.best_of_execute = False
+            cls._instance.max_repair_rounds = 2
+            cls._instance.enable_execution_cache = False
+            cls._instance.execution_cache_max_entries = 1024
+            cls._instance.execution_cache_path = None
+            cls._instance.execution_cache_max_disk_entries = 100000
+            cls._instance.execution_cache_check_interval = 5.0
+            cls._instance.assume_deterministic = False
         return cls._instance
-    
+
     @classmethod
     def set_config(cls, api_key: str, endpoint: str, model_name: str, temperature: float=0.7, model_provider: str="groq", enable_logging: bool=True):
         instance = cls()
         instance.api_key = api_key
         instance.endpoint = endpoint
         instance.model_name = model_name
-        instance.temperature = 0.7
-        instance.model_provider = "groq"
+        instance.temperature = temperature
+        instance.model_provider = model_provider
         instance.enable_logging = enable_logging
 
+    @classmethod
+    def set_cache_config(cls, enable_cache: bool=True, max_entries: int=1024, ttl: float=3600,
+                         path: str=None, max_disk_entries: int=100000, cache_nondeterministic: bool=False):
+        """Configures the LLM response cache. `path` enables the on-disk (SQLite) tier."""
+        instance = cls()
+        instance.enable_cache = enable_cache
+        instance.cache_max_entries = max_entries
+        instance.cache_ttl = ttl
+        instance.cache_path = path
+        instance.cache_max_disk_entries = max_disk_entries
+        instance.cache_nondeterministic = cache_nondeterministic
+
+    @classmethod
+    def set_http_config(cls, max_connections: int=100, max_keepalive_connections: int=20,
+                        keepalive_expiry: float=30.0, request_timeout: float=60.0):
+        """Tunes the HTTP connection pool shared by the async LLM client."""
+        instance = cls()
+        instance.max_connections = max_connections
+        instance.max_keepalive_connections = max_keepalive_connections
+        instance.keepalive_expiry = keepalive_expiry
+        instance.request_timeout = request_timeout
+
+    @classmethod
+    def set_rate_limit_config(cls, requests_per_minute: float=None, tokens_per_minute: float=None,
+                              max_concurrency: int=None, initial_concurrency: int=16, latency_target: float=None,
+                              max_retries: int=5, retry_base_delay: float=0.5, retry_max_delay: float=30.0):
+        """Configures the LLM call governor. Leaving a limit as None disables it."""
+        instance = cls()
+        instance.requests_per_minute = requests_per_minute
+        instance.tokens_per_minute = tokens_per_minute
+        instance.max_concurrency = max_concurrency
+        instance.initial_concurrency = initial_concurrency
+        instance.latency_target = latency_target
+        instance.max_retries = max_retries
+        instance.retry_base_delay = retry_base_delay
+        instance.retry_max_delay = retry_max_delay
+
+    @classmethod
+    def set_execution_config(cls, use_worker_pool: bool=False, pool_size: int=2, preload_modules: tuple=(),
+                             execution_timeout: float=60.0, memory_limit_mb: int=None, max_runs_per_worker: int=100,
+                             max_parallel_executions: int=None):
+        """Configures ExecutionEngine; `use_worker_pool` runs code on warm worker interpreters."""
+        instance = cls()
+        instance.use_worker_pool = use_worker_pool
+        instance.pool_size = pool_size
+        instance.preload_modules = tuple(preload_modules)
+        instance.execution_timeout = execution_timeout
+        instance.memory_limit_mb = memory_limit_mb
+        instance.max_runs_per_worker = max_runs_per_worker
+        instance.max_parallel_executions = max_parallel_executions
+
+    @classmethod
+    def set_formatting_config(cls, formatter_workers: int=None, line_length: int=88, isort_profile: str=None):
+        """Configures the black/isort FormattingService and its process pool size."""
+        instance = cls()
+        instance.formatter_workers = formatter_workers
+        instance.line_length = line_length
+        instance.isort_profile = isort_profile
+
+    @classmethod
+    def set_logging_config(cls, queue_logging: bool=True, max_payload_chars: int=10000,
+                           log_max_bytes: int=None, log_backup_count: int=5, log_queue_size: int=10000):
+        """Configures LoggerManager. `queue_logging` moves file and console I/O to a background thread; callers block once `log_queue_size` records are pending."""
+        instance = cls()
+        instance.queue_logging = queue_logging
+        instance.max_payload_chars = max_payload_chars
+        instance.log_max_bytes = log_max_bytes
+        instance.log_backup_count = log_backup_count
+        instance.log_queue_size = log_queue_size
+
+    @classmethod
+    def set_history_config(cls, capacity: int=1000, path: str=None, backend: str=None):
+        """Configures task history. `path` adds an append-only log; `backend` is "jsonl" or "sqlite" (inferred from the extension)."""
+        instance = cls()
+        instance.history_capacity = capacity
+        instance.history_path = path
+        instance.history_backend = backend
+
+    @classmethod
+    def set_storage_config(cls, compress_threshold: int=65536, compression: str="auto"):
+        """Configures the artifact store. `compression` is "auto", "zstd", "gzip" or None."""
+        instance = cls()
+        instance.compress_threshold = compress_threshold
+        instance.compression = compression
+
+    @classmethod
+    def set_metrics_config(cls, enable_metrics: bool=True, metrics_port: int=None, enable_tracing: bool=False):
+        """Enables per-stage metrics; `metrics_port` serves them for Prometheus, `enable_tracing` adds OpenTelemetry spans."""
+        instance = cls()
+        instance.enable_metrics = enable_metrics
+        instance.metrics_port = metrics_port
+        instance.enable_tracing = enable_tracing
+
+    @classmethod
+    def set_agent_pool_config(cls, agent_pool_size: int=4, agent_pool_warm_up: bool=False):
+        """Configures per-agent instance pools; instances are built on first use unless `agent_pool_warm_up` builds them all at registration."""
+        instance = cls()
+        instance.agent_pool_size = agent_pool_size
+        instance.agent_pool_warm_up = agent_pool_warm_up
+
+    @classmethod
+    def set_batch_config(cls, batch_max_requests: int=1000, batch_flush_interval: float=60.0,
+                         batch_poll_interval: float=30.0, batch_completion_window: str="24h"):
+        """Configures provider batch jobs; buffered requests are submitted when full or after `batch_flush_interval` seconds."""
+        instance = cls()
+        instance.batch_max_requests = batch_max_requests
+        instance.batch_flush_interval = batch_flush_interval
+        instance.batch_poll_interval = batch_poll_interval
+        instance.batch_completion_window = batch_completion_window
+
+    @classmethod
+    def set_prompt_config(cls, max_prompt_tokens: int=None, tokenizer_encoding: str="cl100k_base",
+                          prompt_cache_key: bool=False):
+        """Caps prompt size (None disables trimming); `prompt_cache_key` sends a system-prompt id to endpoints whose provider is "openai"."""
+        instance = cls()
+        instance.max_prompt_tokens = max_prompt_tokens
+        instance.tokenizer_encoding = tokenizer_encoding
+        instance.prompt_cache_key = prompt_cache_key
+
+    @classmethod
+    def set_router_config(cls, router_cache_size: int=4096, router_min_confidence: float=0.6):
+        """Configures task routing: the plan cache size (0 disables it) and the model confidence below which keyword rules decide."""
+        instance = cls()
+        instance.router_cache_size = router_cache_size
+        instance.router_min_confidence = router_min_confidence
+
+    @classmethod
+    def set_admission_config(cls, admission_max_concurrency: int=8, admission_max_queue: int=1000,
+                             admission_block: bool=False, tenant_weights: dict=None):
+        """Configures pipeline admission control; `admission_block` makes submitters wait for room instead of being rejected."""
+        instance = cls()
+        instance.admission_max_concurrency = admission_max_concurrency
+        instance.admission_max_queue = admission_max_queue
+        instance.admission_block = admission_block
+        instance.tenant_weights = tenant_weights
+
+    @classmethod
+    def set_endpoints(cls, endpoints: list):
+        """
+        Prioritized LLM endpoints, primary first, for failover and hedging. Each
+        entry is a dict with optional "name", "endpoint", "api_key", "model_name"
+        and "provider"; missing values come from set_config, and provider
+        "ollama" defaults to the local Ollama server's OpenAI-compatible API.
+        """
+        instance = cls()
+        instance.endpoints = list(endpoints) if endpoints else None
+
+    @classmethod
+    def set_hedging_config(cls, enable_hedging: bool=True, hedge_percentile: float=0.95,
+                           hedge_initial_delay: float=2.0, hedge_min_delay: float=0.05,
+                           hedge_max_delay: float=10.0, failover_cooldown: float=30.0, hedge_max_workers: int=64):
+        """Hedges LLM requests still running after the primary's `hedge_percentile` latency; failed endpoints sit out `failover_cooldown` seconds. Synchronous hedged requests run on `hedge_max_workers` threads."""
+        instance = cls()
+        instance.enable_hedging = enable_hedging
+        instance.hedge_percentile = hedge_percentile
+        instance.hedge_initial_delay = hedge_initial_delay
+        instance.hedge_min_delay = hedge_min_delay
+        instance.hedge_max_delay = hedge_max_delay
+        instance.failover_cooldown = failover_cooldown
+        instance.hedge_max_workers = hedge_max_workers
+
+    @classmethod
+    def set_best_of_config(cls, best_of_n: int=3, best_of_temperature: float=0.8, best_of_execute: bool=False,
+                           max_repair_rounds: int=2):
+        """DeveloperAgent samples `best_of_n` candidates in parallel and keeps the first valid one (1 disables it)."""
+        instance = cls()
+        instance.best_of_n = best_of_n
+        instance.best_of_temperature = best_of_temperature
+        instance.best_of_execute = best_of_execute
+        instance.max_repair_rounds = max_repair_rounds
+
+    @classmethod
+    def set_execution_cache_config(cls, enable_execution_cache: bool=True, max_entries: int=1024, path: str=None,
+                                   max_disk_entries: int=100000, check_interval: float=5.0,
+                                   assume_deterministic: bool=False):
+        """Reuses results of code run with `deterministic=True` (or any code, with `assume_deterministic`); `path` enables the on-disk tier."""
+        instance = cls()
+        instance.enable_execution_cache = enable_execution_cache
+        instance.execution_cache_max_entries = max_entries
+        instance.execution_cache_path = path
+        instance.execution_cache_max_disk_entries = max_disk_entries
+        instance.execution_cache_check_interval = check_interval
+        instance.assume_deterministic = assume_deterministic
+
     @classmethod
     def get_config(cls):
         instance = cls()
@@ -31,5 +289,79 @@ class ConfigManager:
             "model_name": instance.model_name,
             "temperature": instance.temperature,
             "model_provider": instance.model_provider,
-            "enable_logging": instance.enable_logging
+            "enable_logging": instance.enable_logging,
+            "enable_cache": instance.enable_cache,
+            "cache_max_entries": instance.cache_max_entries,
+            "cache_ttl": instance.cache_ttl,
+            "cache_path": instance.cache_path,
+            "cache_max_disk_entries": instance.cache_max_disk_entries,
+            "cache_nondeterministic": instance.cache_nondeterministic,
+            "max_connections": instance.max_connections,
+            "max_keepalive_connections": instance.max_keepalive_connections,
+            "keepalive_expiry": instance.keepalive_expiry,
+            "request_timeout": instance.request_timeout,
+            "requests_per_minute": instance.requests_per_minute,
+            "tokens_per_minute": instance.tokens_per_minute,
+            "max_concurrency": instance.max_concurrency,
+            "initial_concurrency": instance.initial_concurrency,
+            "latency_target": instance.latency_target,
+            "max_retries": instance.max_retries,
+            "retry_base_delay": instance.retry_base_delay,
+            "retry_max_delay": instance.retry_max_delay,
+            "use_worker_pool": instance.use_worker_pool,
+            "pool_size": instance.pool_size,
+            "preload_modules": instance.preload_modules,
+            "execution_timeout": instance.execution_timeout,
+            "memory_limit_mb": instance.memory_limit_mb,
+            "max_runs_per_worker": instance.max_runs_per_worker,
+            "max_parallel_executions": instance.max_parallel_executions,
+            "formatter_workers": instance.formatter_workers,
+            "line_length": instance.line_length,
+            "isort_profile": instance.isort_profile,
+            "queue_logging": instance.queue_logging,
+            "max_payload_chars": instance.max_payload_chars,
+            "log_max_bytes": instance.log_max_bytes,
+            "log_backup_count": instance.log_backup_count,
+            "log_queue_size": instance.log_queue_size,
+            "history_capacity": instance.history_capacity,
+            "history_path": instance.history_path,
+            "history_backend": instance.history_backend,
+            "compress_threshold": instance.compress_threshold,
+            "compression": instance.compression,
+            "enable_metrics": instance.enable_metrics,
+            "metrics_port": instance.metrics_port,
+            "enable_tracing": instance.enable_tracing,
+            "agent_pool_size": instance.agent_pool_size,
+            "agent_pool_warm_up": instance.agent_pool_warm_up,
+            "batch_max_requests": instance.batch_max_requests,
+            "batch_flush_interval": instance.batch_flush_interval,
+            "batch_poll_interval": instance.batch_poll_interval,
+            "batch_completion_window": instance.batch_completion_window,
+            "max_prompt_tokens": instance.max_prompt_tokens,
+            "tokenizer_encoding": instance.tokenizer_encoding,
+            "prompt_cache_key": instance.prompt_cache_key,
+            "router_cache_size": instance.router_cache_size,
+            "router_min_confidence": instance.router_min_confidence,
+            "admission_max_concurrency": instance.admission_max_concurrency,
+            "admission_max_queue": instance.admission_max_queue,
+            "admission_block": instance.admission_block,
+            "tenant_weights": instance.tenant_weights,
+            "endpoints": instance.endpoints,
+            "enable_hedging": instance.enable_hedging,
+            "hedge_percentile": instance.hedge_percentile,
+            "hedge_initial_delay": instance.hedge_initial_delay,
+            "hedge_min_delay": instance.hedge_min_delay,
+            "hedge_max_delay": instance.hedge_max_delay,
+            "failover_cooldown": instance.failover_cooldown,
+            "hedge_max_workers": instance.hedge_max_workers,
+            "best_of_n": instance.best_of_n,
+            "best_of_temperature": instance.best_of_temperature,
+            "best_of_execute": instance.best_of_execute,
+            "max_repair_rounds": instance.max_repair_rounds,
+            "enable_execution_cache": instance.enable_execution_cache,
+            "execution_cache_max_entries": instance.execution_cache_max_entries,
+            "execution_cache_path": instance.execution_cache_path,
+            "execution_cache_max_disk_entries": instance.execution_cache_max_disk_entries,
+            "execution_cache_check_interval": instance.execution_cache_check_interval,
+            "assume_deterministic": instance.assume_deterministic
         }
\ No newline at end of file
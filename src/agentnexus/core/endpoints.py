@@ -0,0 +1,329 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.metrics import Metrics
+
+# Ollama serves an OpenAI-compatible API under /v1, so it needs no separate client
+OLLAMA_BASE_URL = "http://localhost:11434/v1"
+# Providers that accept the `prompt_cache_key` request field; others may reject unknown fields
+PROMPT_CACHE_KEY_PROVIDERS = ("openai",)
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies."""
+
+    def __init__(self, window: int = 256):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int = 20):
+        """The `fraction` quantile of the window, or None until `min_samples` were recorded."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class Endpoint:
+    """One OpenAI-compatible endpoint, with its latency history and health."""
+
+    def __init__(self, name: str, base_url: str, api_key: str, model_name: str = None, client=None,
+                 provider: str = None):
+        self.name = name
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model_name = model_name
+        self.provider = provider
+        self.latency = LatencyTracker()
+        self.failures = 0
+        self.down_until = 0.0
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, index: int, spec: dict, defaults: dict):
+        """Builds an endpoint from a ConfigManager.set_endpoints entry; missing keys come from set_config."""
+        provider = spec.get("provider")
+        if provider == "ollama":
+            if not spec.get("model_name"):
+                # The primary's model (e.g. a hosted Groq model) would not exist on a local Ollama server
+                raise ValueError(f"Endpoint {index} uses provider 'ollama' and needs a 'model_name'")
+            base_url = spec.get("endpoint") or OLLAMA_BASE_URL
+            api_key = spec.get("api_key") or "ollama"
+        else:
+            base_url = spec.get("endpoint") or defaults["endpoint"]
+            api_key = spec.get("api_key") or defaults["api_key"]
+        if not base_url:
+            raise ValueError(f"Endpoint {index} has no 'endpoint' URL")
+        return cls(spec.get("name") or provider or f"endpoint-{index}", base_url, api_key, spec.get("model_name"),
+                   provider=provider or defaults.get("model_provider"))
+
+    @property
+    def client(self):
+        """The synchronous OpenAI client for this endpoint, built on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import openai
+                    self._client = openai.OpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0,
+                                                 timeout=ConfigManager.get_config()["request_timeout"])
+        return self._client
+
+    @property
+    def supports_prompt_cache_key(self) -> bool:
+        return self.provider in PROMPT_CACHE_KEY_PROVIDERS
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_failed(self, cooldown: float):
+        self.failures += 1
+        self.down_until = time.monotonic() + cooldown
+
+    def mark_ok(self):
+        self.failures = 0
+        self.down_until = 0.0
+
+
+class EndpointRouter:
+    """
+    Sends each request to a prioritized list of endpoints.
+
+    Failover: a request that fails with a connection error, a 5xx or an
+    exhausted 429 moves on to the next endpoint, and the failed endpoint is
+    skipped for `failover_cooldown` seconds. Hedging (optional): if the
+    first endpoint has not answered within an adaptive delay (the
+    `hedge_percentile` of its recent latencies), the same request is also
+    sent to the next endpoint; the first successful response wins and the
+    other request is cancelled (a synchronous call cannot be interrupted,
+    so its result is just discarded).
+    """
+
+    def __init__(self, endpoints: list, hedging: bool = None, hedge_percentile: float = None,
+                 hedge_initial_delay: float = None, hedge_min_delay: float = None, hedge_max_delay: float = None,
+                 failover_cooldown: float = None, max_workers: int = None):
+        config = ConfigManager.get_config()
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint")
+        self.endpoints = endpoints
+        self.hedging = hedging if hedging is not None else config["enable_hedging"]
+        self.hedge_percentile = hedge_percentile or config["hedge_percentile"]
+        self.hedge_initial_delay = hedge_initial_delay or config["hedge_initial_delay"]
+        self.hedge_min_delay = hedge_min_delay if hedge_min_delay is not None else config["hedge_min_delay"]
+        self.hedge_max_delay = hedge_max_delay or config["hedge_max_delay"]
+        self.failover_cooldown = failover_cooldown if failover_cooldown is not None else config["failover_cooldown"]
+        self.max_workers = max_workers or config["hedge_max_workers"]
+        self.logger = LoggerManager.get_logger("EndpointRouter")
+        self.metrics = Metrics.get_instance()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @classmethod
+    def from_config(cls, primary_client=None):
+        """Builds the router from ConfigManager; without set_endpoints the single configured endpoint is used."""
+        config = ConfigManager.get_config()
+        specs = config["endpoints"] or [{"name": "primary"}]
+        endpoints = [Endpoint.from_dict(index, spec, config) for index, spec in enumerate(specs)]
+        primary = endpoints[0]
+        if primary_client is not None and primary.base_url == config["endpoint"] \
+                and primary.api_key == config["api_key"]:
+            # Share the handler's client (and its connection pool) for the configured endpoint
+            primary._client = primary_client
+        return cls(endpoints)
+
+    def _candidates(self) -> list:
+        """Healthy endpoints in priority order, then cooling-down ones as a last resort."""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.available()]
+        return healthy + [endpoint for endpoint in self.endpoints if endpoint not in healthy]
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        delay = endpoint.latency.percentile(self.hedge_percentile)
+        if delay is None:
+            delay = self.hedge_initial_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, delay))
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        import openai
+        if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+            return True
+        status = getattr(error, "status_code", None)
+        return status is not None and status >= 500
+
+    def _count(self, attribute: str, metric: str, **labels):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+        self.metrics.inc(metric, **labels)
+
+    def _succeeded(self, endpoint: Endpoint, started: float):
+        endpoint.latency.record(time.perf_counter() - started)
+        endpoint.mark_ok()
+
+    def _failed(self, endpoint: Endpoint, error: Exception):
+        endpoint.mark_failed(self.failover_cooldown)
+        self.logger.warning("[EndpointRouter] Endpoint %s failed, cooling down for %ss: %s",
+                            endpoint.name, self.failover_cooldown, error)
+
+    def _timed(self, send, endpoint: Endpoint, running: threading.Event = None):
+        if running is not None:
+            running.set()
+        started = time.perf_counter()
+        response = send(endpoint)
+        self._succeeded(endpoint, started)
+        return response
+
+    async def _atimed(self, send, endpoint: Endpoint):
+        started = time.perf_counter()
+        response = await send(endpoint)
+        self._succeeded(endpoint, started)
+        return response
+
+    def _failover(self, send, candidates: list, errors: list):
+        for endpoint in candidates:
+            if errors:
+                self._count("failovers", "agentnexus_llm_failovers_total", endpoint=endpoint.name)
+            try:
+                return self._timed(send, endpoint)
+            except Exception as e:
+                if not self._retryable(e):
+                    raise
+                self._failed(endpoint, e)
+                errors.append(e)
+        raise errors[-1]
+
+    async def _afailover(self, send, candidates: list, errors: list):
+        for endpoint in candidates:
+            if errors:
+                self._count("failovers", "agentnexus_llm_failovers_total", endpoint=endpoint.name)
+            try:
+                return await self._atimed(send, endpoint)
+            except Exception as e:
+                if not self._retryable(e):
+                    raise
+                self._failed(endpoint, e)
+                errors.append(e)
+        raise errors[-1]
+
+    def call(self, send, hedge: bool = True):
+        """
+        Sends with failover, and with hedging if enabled; `send(endpoint)`
+        performs one request. Pass `hedge=False` for requests that must not be
+        duplicated, such as opening a stream.
+        """
+        with self._lock:
+            self.requests += 1
+        candidates = self._candidates()
+        if not (hedge and self.hedging) or len(candidates) < 2:
+            return self._failover(send, candidates, [])
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="LLMHedge")
+        primary, secondary = candidates[0], candidates[1]
+        running = threading.Event()
+        futures = {self._executor.submit(self._timed, send, primary, running): primary}
+        # The hedge delay counts from when the primary request starts, not from when it was queued,
+        # so a busy executor does not trigger hedges of requests that have not been sent yet
+        running.wait()
+        started = time.perf_counter()
+        done, _ = wait(futures, timeout=self.hedge_delay(primary))
+        if not done:
+            self._count("hedges", "agentnexus_llm_hedges_total", endpoint=secondary.name)
+            futures[self._executor.submit(self._timed, send, secondary)] = secondary
+
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                endpoint = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    if not self._retryable(e):
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    self._failed(endpoint, e)
+                    errors.append(e)
+                    continue
+                for other in pending:
+                    other.cancel()
+                if endpoint is not primary:
+                    self._hedge_won(primary, endpoint, started)
+                return response
+        return self._failover(send, [endpoint for endpoint in candidates if endpoint not in futures.values()], errors)
+
+    async def acall(self, send, hedge: bool = True):
+        """Async counterpart of call; `send(endpoint)` returns an awaitable."""
+        with self._lock:
+            self.requests += 1
+        candidates = self._candidates()
+        if not (hedge and self.hedging) or len(candidates) < 2:
+            return await self._afailover(send, candidates, [])
+
+        primary, secondary = candidates[0], candidates[1]
+        started = time.perf_counter()
+        tasks = {asyncio.ensure_future(self._atimed(send, primary)): primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if not done:
+                self._count("hedges", "agentnexus_llm_hedges_total", endpoint=secondary.name)
+                tasks[asyncio.ensure_future(self._atimed(send, secondary))] = secondary
+
+            errors = []
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        if not self._retryable(error):
+                            raise error
+                        self._failed(endpoint, error)
+                        errors.append(error)
+                        continue
+                    if endpoint is not primary:
+                        self._hedge_won(primary, endpoint, started)
+                    return task.result()
+        finally:
+            # The losing (or abandoned) request is cancelled
+            for task in tasks:
+                task.cancel()
+        return await self._afailover(send, [endpoint for endpoint in candidates if endpoint not in tasks.values()],
+                                     errors)
+
+    def _hedge_won(self, primary: Endpoint, winner: Endpoint, started: float):
+        self._count("hedge_wins", "agentnexus_llm_hedge_wins_total", endpoint=winner.name)
+        # The primary's true latency is unknown, but at least this long; keep the tracker from only seeing fast calls
+        primary.latency.record(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.requests
+            return {
+                "requests": requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / requests if requests else 0.0,
+                "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+                "failovers": self.failovers,
+                "endpoints": {endpoint.name: {"available": endpoint.available(), "failures": endpoint.failures}
+                              for endpoint in self.endpoints}
+            }
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.metrics import Metrics
+from agentnexus.core.response_cache import ResponseCache
+
+# Runs inside the interpreter that executes the code, so the fingerprint describes that environment
+FINGERPRINT_PROBE = """
+import importlib.metadata, json, platform, sys
+print(json.dumps({
+    "python": sys.version,
+    "implementation": platform.python_implementation(),
+    "executable": sys.executable,
+    "path": [entry for entry in sys.path if entry],
+    "packages": sorted({(dist.metadata["Name"] or "").lower() + "==" + (dist.version or "")
+                        for dist in importlib.metadata.distributions()})
+}))
+"""
+
+
+class ExecutionCache:
+    """
+    Memoizes results of code declared deterministic.
+
+    Results are keyed on the SHA-256 of the code plus a fingerprint of the
+    interpreter that runs it (Python version, executable and installed
+    package set), and kept in a ResponseCache (in-memory LRU, optional
+    SQLite tier with LRU eviction, no expiry). Installing, upgrading or
+    removing a package changes the fingerprint, so entries recorded in the
+    old environment are never served again; the fingerprint is rechecked at
+    most every `check_interval` seconds by stat-ing the interpreter's
+    sys.path directories and recomputed only when one of them changed. Only
+    runs that finished are stored; timeouts, crashes, runs killed by a
+    signal and engine errors are not.
+    Changes to the source of locally imported (non-installed) modules are
+    not part of the fingerprint.
+    """
+
+    def __init__(self, interpreter: str = "python", max_entries: int = 1024, path: str = None,
+                 max_disk_entries: int = 100000, check_interval: float = 5.0):
+        self.interpreter = interpreter
+        self.check_interval = check_interval
+        self.cache = ResponseCache(max_entries=max_entries, ttl=None, path=path, max_disk_entries=max_disk_entries)
+        self.logger = LoggerManager.get_logger("ExecutionCache")
+        self.metrics = Metrics.get_instance()
+        self._fingerprint = None
+        self._stamp = None
+        self._search_path = ()
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, interpreter: str = "python"):
+        """Builds the cache from ConfigManager, or returns None when the execution cache is disabled."""
+        config = ConfigManager.get_config()
+        if not config["enable_execution_cache"]:
+            return None
+        return cls(
+            interpreter=interpreter,
+            max_entries=config["execution_cache_max_entries"],
+            path=config["execution_cache_path"],
+            max_disk_entries=config["execution_cache_max_disk_entries"],
+            check_interval=config["execution_cache_check_interval"]
+        )
+
+    def _probe(self):
+        """Returns (fingerprint, sys.path) of the interpreter, or (None, ()) if it cannot be inspected."""
+        try:
+            completed = subprocess.run([self.interpreter, "-c", FINGERPRINT_PROBE], capture_output=True,
+                                       text=True, timeout=60)
+            environment = json.loads(completed.stdout)
+        except Exception as e:
+            self.logger.error(f"[ExecutionCache] Could not fingerprint {self.interpreter}: {e}", exc_info=True)
+            return None, ()
+        search_path = tuple(environment.pop("path"))
+        payload = json.dumps(environment, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest(), search_path
+
+    def _environment_stamp(self, search_path: tuple) -> tuple:
+        """Cheap change detector: where the interpreter resolves to, and the mtimes of its import directories."""
+        stamp = [shutil.which(self.interpreter) or self.interpreter]
+        for entry in search_path:
+            try:
+                stamp.append(os.stat(entry).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def fingerprint(self):
+        """The current environment fingerprint, or None if the interpreter cannot be inspected."""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._fingerprint
+            self._checked_at = now
+            stamp = self._environment_stamp(self._search_path)
+            if stamp == self._stamp:
+                return self._fingerprint
+
+            previous = self._fingerprint
+            self._fingerprint, self._search_path = self._probe()
+            self._stamp = self._environment_stamp(self._search_path)
+            if previous is not None and self._fingerprint != previous:
+                self.metrics.inc("agentnexus_execution_environment_changes_total")
+                self.logger.info("[ExecutionCache] Environment of %s changed; earlier results will not be reused",
+                                 self.interpreter)
+            return self._fingerprint
+
+    def make_key(self, code: str, *settings):
+        """Key of `code` in the current environment; None when there is no fingerprint to key on."""
+        fingerprint = self.fingerprint()
+        if fingerprint is None:
+            return None
+        return ResponseCache.make_key("execution", hashlib.sha256(code.encode("utf-8")).hexdigest(),
+                                      fingerprint, *settings)
+
+    def get(self, key: str):
+        value = self.cache.get(key)
+        return json.loads(value) if value is not None else None
+
+    @staticmethod
+    def cacheable(result: dict, returncode: int = None) -> bool:
+        """
+        Whether `result` is the code's own outcome. An "error" result (timeout,
+        worker crash, engine failure, missing module) or a run ended by a
+        signal (negative return code) may go differently next time.
+        """
+        if "error" in result or result.get("timed_out"):
+            return False
+        return returncode is None or returncode >= 0
+
+    def put(self, key: str, result: dict, returncode: int = None):
+        if self.cacheable(result, returncode):
+            self.cache.put(key, json.dumps(result))
+
+    def invalidate(self):
+        """Drops every stored result and forces the fingerprint to be recomputed."""
+        with self._lock:
+            self._stamp = None
+            self._checked_at = None
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        stats["fingerprint"] = self._fingerprint
+        return stats
+
+    def close(self):
+        self.cache.close()
@@ -1,27 +1,138 @@
+import asyncio
 import tempfile
 import subprocess
 import os
 import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.execution_cache import ExecutionCache
 from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.metrics import Metrics
+from agentnexus.core.worker_pool import InterpreterPool
 
 class ExecutionEngine:
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Bounds concurrent executions started through aexecute_python
+    _executor = None
+    _executor_lock = threading.Lock()
+
     def __init__(self):
         self.logger = LoggerManager.get_logger("ExecutionEngine")
+        config = ConfigManager.get_config()
+        self.timeout = config["execution_timeout"]
+        self.max_parallel = config["max_parallel_executions"] or os.cpu_count() or 1
+        # Warm worker interpreters are shared by every engine in the process
+        self.pool = InterpreterPool.get_instance() if config["use_worker_pool"] else None
+        self.metrics = Metrics.get_instance()
+        self.assume_deterministic = config["assume_deterministic"]
+        # Workers run on this interpreter; subprocesses on whatever "python" resolves to
+        self.cache = ExecutionCache.from_config(sys.executable if self.pool is not None else "python")
+        # Settings that can change the outcome of the same code
+        self._cache_settings = (config["memory_limit_mb"] if self.pool is not None else None,)
 
-    def execute_python(self, code: str) -> dict:
-        '''Executes python code'''
-        temp_script_path = None
+    @classmethod
+    def get_instance(cls):
+        """Returns the engine shared by every agent in the process."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def _get_executor(cls, max_workers: int) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                   thread_name_prefix="ExecutionEngine")
+            return cls._executor
+
+    def execute_python(self, code: str, deterministic: bool = None) -> dict:
+        '''
+        Executes python code. With `deterministic` (default: the configured
+        assume_deterministic) the caller declares that the code's result only
+        depends on the code and the environment, so the execution cache may
+        serve a previous result instead of running it again.
+        '''
+        return self._execute(code, deterministic)[0]
+
+    async def aexecute_python(self, code: str, deterministic: bool = None) -> dict:
+        '''Executes python code without blocking the event loop'''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(self.max_parallel), self.execute_python,
+                                          code, deterministic)
+
+    def execute_many(self, codes, max_parallel: int = None, deterministic: bool = None):
+        '''
+        Executes many snippets concurrently, at most `max_parallel` at a time.
+        Yields (index, result) pairs as each one completes; every result
+        carries a "metrics" dict with wall_time, cpu_time and peak_rss_kb
+        (None where the platform or the worker pool cannot measure it).
+        '''
+        max_parallel = max_parallel or self.max_parallel
+        codes = iter(enumerate(codes))
+        executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="ExecutionEngine")
+        pending = {}
+
+        def _submit_next():
+            item = next(codes, None)
+            if item is not None:
+                index, code = item
+                pending[executor.submit(self._execute_with_metrics, code, deterministic)] = index
+            return item is not None
 
         try:
-            self.logger.info(f"Executing code: {code}")
-            with tempfile.NamedTemporaryFile(mode='w', suffix=".py", delete=False) as temp_file:
-                temp_file.write(code)
-                temp_script_path = temp_file.name
+            while len(pending) < max_parallel and _submit_next():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    _submit_next()
+                    yield index, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _execute_with_metrics(self, code: str, deterministic: bool = None) -> dict:
+        result, metrics = self._execute(code, deterministic)
+        return dict(result, metrics=metrics)
+
+    def _execute(self, code: str, deterministic: bool = None):
+        '''Runs code, or serves a cached result of deterministic code, and returns (result, metrics)'''
+        if deterministic is None:
+            deterministic = self.assume_deterministic
+        cache_key = self.cache.make_key(code, *self._cache_settings) if deterministic and self.cache is not None else None
+        if cache_key is not None:
+            started = time.perf_counter()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.inc("agentnexus_cache_hits_total", cache="execution")
+                self.logger.info("Serving cached execution result")
+                return cached, {"wall_time": time.perf_counter() - started, "cpu_time": 0.0, "peak_rss_kb": None}
 
-            result = subprocess.run(["python", temp_script_path], capture_output=True, text=True)
-            output = result.stdout.strip() if result.stdout else result.stderr.strip()
+        result, metrics, returncode = self._run(code)
+        if cache_key is not None:
+            self.cache.put(cache_key, result, returncode)
+        return result, metrics
+
+    def _run(self, code: str):
+        '''Returns (result, metrics, returncode); returncode is None when the code did not run to an exit'''
+        started = time.perf_counter()
+        metrics = {"wall_time": None, "cpu_time": None, "peak_rss_kb": None}
+        try:
+            self.logger.info("Executing code: %s", code)
+            if self.pool is not None:
+                returncode, stdout, stderr, usage = self._run_in_pool(code)
+            else:
+                returncode, stdout, stderr, usage = self._run_in_subprocess(code)
+            metrics.update(usage)
+            output = stdout.strip() if stdout else stderr.strip()
 
             if "ModuleNotFoundError" in output:
                 missing_module = re.search(r"ModuleNotFoundError: No module named '(.+)'", output)
@@ -31,18 +142,88 @@ class ExecutionEngine:
                         "execution_success": False,
                         "error": f"Missing module: '{module_name}'. Please install it using:\n"
                                 f"   pip install {module_name}"
-                    }
-            self.logger.info(f"Execution completed successfully")
+                    }, metrics, returncode
+            self.logger.info("Execution completed successfully")
             return {
-                "execution_success": result.returncode == 0,
+                "execution_success": returncode == 0,
                 "output": output
-            }
+            }, metrics, returncode
         except Exception as e:
             self.logger.error(f"Error executing code: {e}", exc_info=True)
             return {
                 "execution_success": False,
                 "error": str(e)
-            }
+            }, metrics, None
+        finally:
+            metrics["wall_time"] = time.perf_counter() - started
+            self.metrics.observe("agentnexus_stage_duration_seconds", metrics["wall_time"], stage="execute",
+                                 mode="pool" if self.pool is not None else "subprocess")
+
+    def _run_in_pool(self, code: str):
+        result = self.pool.execute(code, timeout=self.timeout)
+        # A warm worker's peak RSS is its lifetime high-water mark, not this snippet's, so it is not reported
+        usage = {"cpu_time": result.get("cpu_time"), "peak_rss_kb": None}
+        return result["returncode"], result["stdout"], result["stderr"], usage
+
+    def _run_in_subprocess(self, code: str):
+        temp_script_path = None
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', suffix=".py", delete=False) as temp_file:
+                temp_file.write(code)
+                temp_script_path = temp_file.name
+
+            process = subprocess.Popen(["python", temp_script_path], stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, text=True)
+            return self._wait_with_usage(process)
         finally:
             if temp_script_path and os.path.exists(temp_script_path):
-                os.remove(temp_script_path)
\ No newline at end of file
+                os.remove(temp_script_path)
+
+    def _wait_with_usage(self, process: subprocess.Popen):
+        '''Collects output and reaps the child with wait4 to get its own CPU time and peak RSS'''
+        if not hasattr(os, "wait4"):
+            # Windows: no per-child resource usage, only the output
+            try:
+                stdout, stderr = process.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            return process.returncode, stdout, stderr, {"cpu_time": None, "peak_rss_kb": None}
+
+        streams = {}
+        readers = [
+            threading.Thread(target=lambda name=name, pipe=pipe: streams.__setitem__(name, pipe.read()))
+            for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = threading.Event()
+
+        def _kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(self.timeout, _kill) if self.timeout else None
+        if timer:
+            timer.start()
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        finally:
+            if timer:
+                timer.cancel()
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        for reader in readers:
+            reader.join()
+        process.stdout.close()
+        process.stderr.close()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(process.args, self.timeout)
+
+        # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+        peak_rss_kb = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+        usage = {"cpu_time": rusage.ru_utime + rusage.ru_stime, "peak_rss_kb": peak_rss_kb}
+        return process.returncode, streams.get("stdout", ""), streams.get("stderr", ""), usage
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+
+def format_code(code: str, line_length: int = 88, isort_profile: str = None) -> str:
+    """Formats code using Black and sorts imports using isort. Returns the input on failure."""
+    # Imported on first use: black and isort dominate the package's import time
+    import black
+    import isort
+
+    try:
+        formatted_code = black.format_str(code, mode=black.FileMode(line_length=line_length))
+        if isort_profile:
+            return isort.code(formatted_code, profile=isort_profile)
+        return isort.code(formatted_code)
+    except Exception:
+        return code
+
+
+def _warm_worker():
+    # Pay black's and isort's first-call setup once per worker, not per job
+    format_code("x = 1\n")
+
+
+class FormattingService:
+    """
+    Black/isort formatting with a content-hash cache and a process pool,
+    so CPU-bound formatting does not hold the GIL of the calling process.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = None, cache_size: int = 1024,
+                 line_length: int = 88, isort_profile: str = None):
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.line_length = line_length
+        self.isort_profile = isort_profile
+        self.hits = 0
+        self.misses = 0
+        self.logger = LoggerManager.get_logger("FormattingService")
+        self._config_key = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                config = ConfigManager.get_config()
+                cls._instance = cls(
+                    max_workers=config["formatter_workers"],
+                    line_length=config["line_length"],
+                    isort_profile=config["isort_profile"]
+                )
+            return cls._instance
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def _get_config_key(self) -> str:
+        """Formatter versions and options; read from package metadata so black need not load here."""
+        if self._config_key is None:
+            from importlib.metadata import PackageNotFoundError, version
+            versions = {}
+            for package in ("black", "isort"):
+                try:
+                    versions[package] = version(package)
+                except PackageNotFoundError:
+                    versions[package] = None
+            self._config_key = (f"black:{versions['black']}:{self.line_length}"
+                                f"|isort:{versions['isort']}:{self.isort_profile}")
+        return self._config_key
+
+    def _key(self, code: str) -> str:
+        return hashlib.sha256(f"{self._get_config_key()}\0{code}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, code: str):
+        key = self._key(code)
+        with self._lock:
+            formatted = self._cache.get(key)
+            if formatted is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        return key, formatted
+
+    def _store(self, key: str, formatted: str):
+        with self._lock:
+            self._cache[key] = formatted
+            # Formatting is idempotent: remember the output as already formatted
+            self._cache[self._key(formatted)] = formatted
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def format(self, code: str) -> str:
+        """Formats inline on the calling thread, skipping work for cached or already formatted code."""
+        key, formatted = self._lookup(code)
+        if formatted is None:
+            formatted = format_code(code, self.line_length, self.isort_profile)
+            self._store(key, formatted)
+        return formatted
+
+    async def aformat(self, code: str) -> str:
+        """Formats in the process pool without blocking the event loop."""
+        key, formatted = self._lookup(code)
+        if formatted is None:
+            loop = asyncio.get_running_loop()
+            formatted = await loop.run_in_executor(
+                self._get_executor(), format_code, code, self.line_length, self.isort_profile
+            )
+            self._store(key, formatted)
+        return formatted
+
+    def format_many(self, codes: list) -> list:
+        """Formats many sources across the process pool, preserving order."""
+        results = [None] * len(codes)
+        futures = {}
+        for index, code in enumerate(codes):
+            key, formatted = self._lookup(code)
+            if formatted is not None:
+                results[index] = formatted
+            else:
+                future = self._get_executor().submit(format_code, code, self.line_length, self.isort_profile)
+                futures[index] = (key, future)
+
+        for index, (key, future) in futures.items():
+            results[index] = future.result()
+            self._store(key, results[index])
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
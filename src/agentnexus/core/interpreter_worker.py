@@ -0,0 +1,151 @@
+"""
+Warm interpreter worker, run as a script by InterpreterPool.
+
+Speaks length-prefixed JSON over its original stdin/stdout. File
+descriptors 1 and 2 are redirected to scratch files so that anything the
+executed code writes (including C extensions and child processes) is
+captured without corrupting the protocol stream.
+"""
+import builtins
+import json
+import os
+import struct
+import sys
+import tempfile
+import traceback
+
+try:
+    import resource
+except ImportError:
+    # Windows: no rlimits
+    resource = None
+
+HEADER = struct.Struct(">I")
+
+
+def read_message(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    (length,) = HEADER.unpack(header)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream, message):
+    payload = json.dumps(message).encode("utf-8")
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def read_scratch(fd):
+    os.lseek(fd, 0, os.SEEK_SET)
+    chunks = []
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.ftruncate(fd, 0)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def preload(modules):
+    errors = {}
+    for name in modules:
+        try:
+            __import__(name)
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+    return errors
+
+
+def set_memory_limit(limit_mb):
+    if not limit_mb or resource is None:
+        return
+    limit = int(limit_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run_code(code):
+    """Executes `code` like `python script.py` would and returns its exit code."""
+    try:
+        compiled = compile(code, "<snippet>", "exec")
+        exec(compiled, {"__name__": "__main__", "__builtins__": builtins})
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException as e:
+        # Drop this frame so the traceback starts at the snippet, as in a real script
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        return 1
+
+
+def main():
+    # Run snippets like `python -c` would, not from this package directory
+    sys.path[0] = ""
+
+    proto_in = os.fdopen(os.dup(0), "rb")
+    proto_out = os.fdopen(os.dup(1), "wb")
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    out_scratch = tempfile.TemporaryFile()
+    err_scratch = tempfile.TemporaryFile()
+    os.dup2(out_scratch.fileno(), 1)
+    os.dup2(err_scratch.fileno(), 2)
+
+    config = read_message(proto_in) or {}
+    errors = preload(config.get("preload", []))
+    set_memory_limit(config.get("memory_limit_mb"))
+    read_scratch(1)
+    read_scratch(2)
+    write_message(proto_out, {"ready": True, "preload_errors": errors})
+
+    cwd = os.getcwd()
+    base_path = list(sys.path)
+    base_environ = dict(os.environ)
+    stdout, stderr = sys.stdout, sys.stderr
+
+    while True:
+        request = read_message(proto_in)
+        if request is None:
+            break
+
+        usage_before = os.times()
+        returncode = run_code(request["code"])
+        usage_after = os.times()
+
+        sys.stdout, sys.stderr = stdout, stderr
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+
+        response = {
+            "returncode": returncode,
+            "stdout": read_scratch(1),
+            "stderr": read_scratch(2),
+            "cpu_time": (usage_after.user - usage_before.user) + (usage_after.system - usage_before.system)
+        }
+
+        # Undo the most common process-wide side effects between runs
+        os.chdir(cwd)
+        sys.path[:] = base_path
+        if os.environ != base_environ:
+            os.environ.clear()
+            os.environ.update(base_environ)
+
+        write_message(proto_out, response)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 from agentnexus.core.config_manager import ConfigManager
 from agentnexus.core.logger_manager import LoggerManager
-import openai
+from agentnexus.core.endpoints import EndpointRouter
+from agentnexus.core.metrics import Metrics
+from agentnexus.core.prompt_budget import PromptBudget
+from agentnexus.core.response_cache import ResponseCache
+from agentnexus.core.rate_limiter import LLMGovernor
+from agentnexus.core.single_flight import SingleFlight
+import asyncio
 import json
+import threading
+import time
+import weakref
 
 class LLMHandler:
     """
@@ -10,6 +19,25 @@ class LLMHandler:
     """
 
     _instance = None
+    _instance_lock = threading.Lock()
+    _cache = None
+    _cache_lock = threading.Lock()
+
+    # Pooled AsyncOpenAI clients per event loop (one per endpoint), shared by every handler
+    _async_clients = weakref.WeakKeyDictionary()
+    _async_lock = threading.Lock()
+
+    # Provider batch jobs are shared by every handler, like the response cache
+    _batch_client = None
+    _batch_lock = threading.Lock()
+
+    # Identical in-flight requests share one upstream call (sync and async)
+    single_flight = SingleFlight()
+
+    RESPONSE_FORMAT = { "type": "json_object" }
+
+    # Rough completion size reserved against the tokens/min budget before usage is known
+    COMPLETION_TOKEN_ESTIMATE = 512
 
     def __init__(self):
         config = ConfigManager.get_config()
@@ -17,43 +45,322 @@ class LLMHandler:
         self.endpoint = config["endpoint"]
         self.model_name = config["model_name"]
         self.temperature = config["temperature"]
+        self.cache_nondeterministic = config["cache_nondeterministic"]
+        self.prompt_cache_key = config["prompt_cache_key"]
         self.logger = LoggerManager.get_logger("LLMHandler")
 
-        # OpenAI client initialized ONCE (Singleton)
+        # openai is imported here rather than at module level; it is slow to import
+        import openai
+
+        # OpenAI client initialized ONCE (Singleton); retries are owned by the governor
         self.client = openai.OpenAI(
             base_url=self.endpoint,
-            api_key=self.api_key
+            api_key=self.api_key,
+            max_retries=0
         )
 
+        # Rate limits and 429 handling are shared by every agent in the process
+        self.governor = LLMGovernor.get_instance()
+        self.metrics = Metrics.get_instance()
+
+        # Response cache is shared by every handler in the process
+        self.cache = self.get_cache()
+        # Failover and hedging across ConfigManager.set_endpoints; a single endpoint without them
+        self.router = EndpointRouter.from_config(primary_client=self.client)
+        self.prompt_budget = PromptBudget()
+
     @classmethod
     def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
 
-    def generate(self, system_prompt: str, prompt: str,
-                      temperature: float = None, model_name: str = None) -> str:
-       
-        try:
-            response = self.client.chat.completions.create(
-                model=model_name if model_name else self.model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature if temperature else self.temperature,
-                response_format={ "type": "json_object" }
-            )
+    @classmethod
+    def get_cache(cls):
+        """Returns the process-wide response cache, or None when caching is disabled."""
+        with cls._cache_lock:
+            if cls._cache is None:
+                cls._cache = ResponseCache.from_config()
+            return cls._cache
+
+    @classmethod
+    def get_async_client(cls, base_url: str = None, api_key: str = None):
+        """
+        Returns the AsyncOpenAI client for an endpoint (default: the configured
+        one) bound to the running event loop, creating it once.
+        """
+        loop = asyncio.get_running_loop()
+        config = ConfigManager.get_config()
+        base_url = base_url or config["endpoint"]
+        api_key = api_key or config["api_key"]
+        with cls._async_lock:
+            clients = cls._async_clients.setdefault(loop, {})
+            client = clients.get((base_url, api_key))
+            if client is None:
+                import httpx
+                import openai
+                http_client = openai.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=config["max_connections"],
+                        max_keepalive_connections=config["max_keepalive_connections"],
+                        keepalive_expiry=config["keepalive_expiry"]
+                    ),
+                    timeout=config["request_timeout"]
+                )
+                client = openai.AsyncOpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=http_client,
+                    max_retries=0
+                )
+                clients[(base_url, api_key)] = client
+            return client
+
+    def get_batch_client(self):
+        """Returns the process-wide provider batch client, creating it on first use."""
+        with self._batch_lock:
+            if LLMHandler._batch_client is None:
+                from agentnexus.core.batch_client import LLMBatchClient
+                LLMHandler._batch_client = LLMBatchClient(self)
+            return LLMHandler._batch_client
 
-            result = response.choices[0].message.content
-            self.logger.info("[LLMHandler] LLM response received successfully")
-            print("RESS : ", result)
-            return result
+    def submit_batch(self, system_prompt: str, prompt: str,
+                     temperature: float = None, model_name: str = None, context: list = None):
+        """
+        Queues a request for the provider batch API and returns a
+        concurrent.futures.Future that resolves to the completion text once
+        its batch job finishes. Meant for offline workloads: batch jobs are
+        cheaper but can take up to the completion window.
+        """
+        return self.get_batch_client().submit(system_prompt, prompt, temperature, model_name, context)
 
-        except openai.APIConnectionError as e:
+    def hedge_stats(self) -> dict:
+        """Request, hedge and failover counts of the endpoint router, with hedge and win rates."""
+        return self.router.stats()
+
+    def flush_batch(self):
+        """Submits the buffered batch requests now instead of waiting for the batch to fill."""
+        return self.get_batch_client().flush()
+
+    @classmethod
+    async def aclose(cls):
+        """Closes the async clients of the running event loop and their connection pools."""
+        loop = asyncio.get_running_loop()
+        with cls._async_lock:
+            clients = cls._async_clients.pop(loop, {})
+        for client in clients.values():
+            await client.close()
+
+    def _resolve(self, temperature: float, model_name: str):
+        return (model_name if model_name else self.model_name,
+                temperature if temperature is not None else self.temperature)
+
+    def _request_key(self, system_prompt: str, prompt: str, model_name: str, temperature: float,
+                     context: list = None) -> str:
+        """Hashes the full request; used for both coalescing and caching."""
+        parts = [self.endpoint, model_name, temperature, system_prompt, prompt, self.RESPONSE_FORMAT]
+        if context:
+            parts.append(context)
+        return ResponseCache.make_key(*parts)
+
+    def _cacheable(self, temperature: float) -> bool:
+        """Requests with temperature > 0 bypass the cache unless configured otherwise."""
+        if self.cache is None:
+            return False
+        return not (temperature and temperature > 0) or self.cache_nondeterministic
+
+    def _from_cache(self, cache_key: str):
+        if not cache_key:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.metrics.inc("agentnexus_cache_hits_total", cache="llm")
+            self.logger.info("[LLMHandler] LLM response served from cache")
+        return cached
+
+    def _to_cache(self, cache_key: str, result: str):
+        if cache_key and result is not None:
+            self.cache.put(cache_key, result)
+
+    def _request_kwargs(self, system_prompt: str, prompt: str, model_name: str, temperature: float,
+                        context: list = None) -> dict:
+        # The fixed system prompt stays first so provider-side prompt caching sees a stable prefix
+        request = {
+            "model": model_name,
+            "messages": self.prompt_budget.build_messages(system_prompt, prompt, context),
+            "temperature": temperature,
+            "response_format": self.RESPONSE_FORMAT
+        }
+        return request
+
+    def _prompt_cache_fields(self, endpoint, request: dict) -> dict:
+        """Extra body fields naming the system prompt for the provider's cache, where the provider supports them."""
+        if not (self.prompt_cache_key and endpoint.supports_prompt_cache_key):
+            return {}
+        return {"prompt_cache_key": PromptBudget.prefix_key(request["messages"][0]["content"])}
+
+    def _estimate_tokens(self, request: dict) -> int:
+        return self.prompt_budget.estimate(request["messages"]) + self.COMPLETION_TOKEN_ESTIMATE
+
+    def _raise_api_error(self, e: Exception):
+        import openai
+        if isinstance(e, openai.APIConnectionError):
             self.logger.error(f"API Connection Error: {e}")
             raise Exception(f"API Connection Error: {e}")
+        self.logger.error(f"OpenAI API Error: {e}")
+        raise Exception(f"OpenAI API Error: {e}")
 
+    def _read_response(self, response) -> str:
+        result = response.choices[0].message.content
+        self.metrics.record_usage(getattr(response, "usage", None), model=getattr(response, "model", None))
+        self.logger.info("[LLMHandler] LLM response received successfully")
+        self.logger.debug("[LLMHandler] Response: %s", result)
+        return result
+
+    def _for_endpoint(self, endpoint, request: dict) -> dict:
+        request = dict(request, model=endpoint.model_name) if endpoint.model_name else request
+        fields = self._prompt_cache_fields(endpoint, request)
+        # Sent as extra body fields so openai releases without the keyword argument still accept it
+        return dict(request, extra_body=fields) if fields else request
+
+    def _send(self, endpoint, request: dict, estimated_tokens: int, **options):
+        request = self._for_endpoint(endpoint, request)
+        if endpoint is self.router.endpoints[0]:
+            # The governor's rate limits describe the primary provider only
+            return self.governor.call(
+                lambda: endpoint.client.chat.completions.create(**options, **request),
+                estimated_tokens
+            )
+        return endpoint.client.chat.completions.create(**options, **request)
+
+    async def _asend(self, endpoint, request: dict, estimated_tokens: int):
+        request = self._for_endpoint(endpoint, request)
+        client = self.get_async_client(endpoint.base_url, endpoint.api_key)
+        if endpoint is self.router.endpoints[0]:
+            return await self.governor.acall(
+                lambda: client.chat.completions.create(**request),
+                estimated_tokens
+            )
+        return await client.chat.completions.create(**request)
+
+    def _fetch(self, request: dict, estimated_tokens: int, cache_key: str) -> str:
+        import openai
+        try:
+            with self.metrics.timer("llm_request", model=request["model"]):
+                response = self.router.call(lambda endpoint: self._send(endpoint, request, estimated_tokens))
+        except openai.APIError as e:
+            self._raise_api_error(e)
+
+        result = self._read_response(response)
+        self._to_cache(cache_key, result)
+        return result
+
+    async def _afetch(self, request: dict, estimated_tokens: int, cache_key: str) -> str:
+        import openai
+        try:
+            with self.metrics.timer("llm_request", model=request["model"]):
+                response = await self.router.acall(
+                    lambda endpoint: self._asend(endpoint, request, estimated_tokens)
+                )
+        except openai.APIError as e:
+            self._raise_api_error(e)
+
+        result = self._read_response(response)
+        self._to_cache(cache_key, result)
+        return result
+
+    def generate(self, system_prompt: str, prompt: str,
+                      temperature: float = None, model_name: str = None, context: list = None,
+                      fresh: bool = False) -> str:
+        """
+        `context` is an optional list of prior messages, placed between the
+        system and user prompt. `fresh` always sends a new request: the cache
+        and coalescing with identical in-flight requests are bypassed, e.g. to
+        sample several independent candidates.
+        """
+
+        model_name, temperature = self._resolve(temperature, model_name)
+        if fresh:
+            request = self._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+            return self._fetch(request, self._estimate_tokens(request), None)
+
+        request_key = self._request_key(system_prompt, prompt, model_name, temperature, context)
+        cache_key = request_key if self._cacheable(temperature) else None
+        cached = self._from_cache(cache_key)
+        if cached is not None:
+            return cached
+
+        request = self._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+        estimated_tokens = self._estimate_tokens(request)
+        return self.single_flight.do(
+            request_key, lambda: self._fetch(request, estimated_tokens, cache_key)
+        )
+
+    async def agenerate(self, system_prompt: str, prompt: str,
+                        temperature: float = None, model_name: str = None, context: list = None,
+                        fresh: bool = False) -> str:
+        """Async counterpart of generate, awaiting the pooled AsyncOpenAI client."""
+
+        model_name, temperature = self._resolve(temperature, model_name)
+        if fresh:
+            request = self._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+            return await self._afetch(request, self._estimate_tokens(request), None)
+
+        request_key = self._request_key(system_prompt, prompt, model_name, temperature, context)
+        cache_key = request_key if self._cacheable(temperature) else None
+        cached = self._from_cache(cache_key)
+        if cached is not None:
+            return cached
+
+        request = self._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+        estimated_tokens = self._estimate_tokens(request)
+        return await self.single_flight.ado(
+            request_key, lambda: self._afetch(request, estimated_tokens, cache_key)
+        )
+
+    def generate_stream(self, system_prompt: str, prompt: str,
+                        temperature: float = None, model_name: str = None, context: list = None):
+        """
+        Yields the completion in chunks as they arrive. Closing the generator
+        early aborts the upstream request. Cached responses are yielded whole.
+        """
+
+        model_name, temperature = self._resolve(temperature, model_name)
+        cache_key = self._request_key(system_prompt, prompt, model_name, temperature, context) \
+            if self._cacheable(temperature) else None
+        cached = self._from_cache(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        import openai
+        request = self._request_kwargs(system_prompt, prompt, model_name, temperature, context)
+        started = time.perf_counter()
+        try:
+            # Failover only: a hedged duplicate stream would be left open
+            estimated_tokens = self._estimate_tokens(request)
+            stream = self.router.call(
+                lambda endpoint: self._send(endpoint, request, estimated_tokens, stream=True), hedge=False
+            )
         except openai.APIError as e:
-            self.logger.error(f"OpenAI API Error: {e}")
-            raise Exception(f"OpenAI API Error: {e}")
+            self._raise_api_error(e)
+
+        parts = []
+        try:
+            for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except openai.APIError as e:
+            self._raise_api_error(e)
+        finally:
+            stream.close()
+            self.metrics.observe("agentnexus_stage_duration_seconds", time.perf_counter() - started,
+                                 stage="llm_stream", model=model_name)
+
+        self.logger.info("[LLMHandler] LLM stream completed successfully")
+        self._to_cache(cache_key, "".join(parts))
@@ -1,19 +1,112 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 
 from agentnexus.core.config_manager import ConfigManager
 
+class TruncatingFormatter(logging.Formatter):
+    """Formatter that caps the rendered message so large payloads cannot flood the logs."""
+
+    def __init__(self, fmt=None, max_chars: int = None):
+        super().__init__(fmt)
+        self.max_chars = max_chars
+
+    def format(self, record):
+        message = record.getMessage()
+        if self.max_chars and len(message) > self.max_chars:
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars]"
+            record.args = None
+        return super().format(record)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records for the listener thread, rendering as little as possible
+    on the caller's thread. Messages whose arguments are all immutable scalars
+    are formatted later; any other arguments (dicts, lists, agent outputs) are
+    rendered now, so the log shows their state at the call and the queue holds
+    no references to them. Tracebacks are always rendered at enqueue. The
+    queue is bounded: when the listener falls behind, callers block.
+    """
+
+    SCALARS = (str, int, float, bool, bytes, type(None))
+
+    def __init__(self, log_queue, max_chars: int = None):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, self.SCALARS) for arg in args)):
+            record = logging.makeLogRecord(record.__dict__)
+            message = record.getMessage()
+            if self.max_chars and len(message) > self.max_chars:
+                message = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars]"
+            record.msg, record.args = message, None
+        if record.exc_info:
+            record = logging.makeLogRecord(record.__dict__)
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            # The traceback keeps every frame's locals alive while queued
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Blocks when the queue is full instead of dropping the record
+        self.queue.put(record)
+
+
+class _CreateDirMixin:
+    """Opens the log file on first emit, creating its directory only then."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LazyFileHandler(_CreateDirMixin, logging.FileHandler):
+    pass
+
+
+class LazyRotatingFileHandler(_CreateDirMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class LazyLogger:
+    """Class attribute descriptor that calls LoggerManager.get_logger on first access."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.logger = None
+
+    def __get__(self, instance, owner):
+        if self.logger is None:
+            self.logger = LoggerManager.get_logger(self.name)
+        return self.logger
+
+
 class LoggerManager:
     """Centralized logger for all agents with global logging control."""
 
     LOG_DIR = "logs"
     LOG_FILE = os.path.join(LOG_DIR, "agent_logs.log")
+    LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+    _handlers = None
+    _queue_handler = None
+    _listener = None
+    _lock = threading.Lock()
 
     @staticmethod
     def get_logger(name):
         """Returns a logger instance with logging enabled/disabled based on ConfigManager."""
         config = ConfigManager.get_config()
-        log_enabled = config.get("enable_logging", True)  
+        log_enabled = config.get("enable_logging", True)
 
         logger = logging.getLogger(name)
 
@@ -21,23 +114,62 @@ class LoggerManager:
             logger.setLevel(logging.CRITICAL)
             return logger
 
-        if not os.path.exists(LoggerManager.LOG_DIR):
-            os.makedirs(LoggerManager.LOG_DIR)
-
-        if not logger.hasHandlers():  
+        if not logger.hasHandlers():
             logger.setLevel(logging.DEBUG)
 
-            formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+            if config.get("queue_logging"):
+                logger.addHandler(LoggerManager._get_queue_handler(config))
+            else:
+                for handler in LoggerManager._get_handlers(config):
+                    logger.addHandler(handler)
 
-            file_handler = logging.FileHandler(LoggerManager.LOG_FILE)
-            file_handler.setFormatter(formatter)
-            file_handler.setLevel(logging.DEBUG)
+        return logger
 
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            console_handler.setLevel(logging.INFO)
+    @staticmethod
+    def _get_handlers(config):
+        """File and console handlers, built once and shared by every logger."""
+        with LoggerManager._lock:
+            if LoggerManager._handlers is None:
+                formatter = TruncatingFormatter(LoggerManager.LOG_FORMAT, config.get("max_payload_chars"))
 
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
+                if config.get("log_max_bytes"):
+                    file_handler = LazyRotatingFileHandler(
+                        LoggerManager.LOG_FILE,
+                        maxBytes=config["log_max_bytes"],
+                        backupCount=config.get("log_backup_count", 5),
+                        delay=True
+                    )
+                else:
+                    file_handler = LazyFileHandler(LoggerManager.LOG_FILE, delay=True)
+                file_handler.setFormatter(formatter)
+                file_handler.setLevel(logging.DEBUG)
 
-        return logger
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(formatter)
+                console_handler.setLevel(logging.INFO)
+
+                LoggerManager._handlers = [file_handler, console_handler]
+            return LoggerManager._handlers
+
+    @staticmethod
+    def _get_queue_handler(config):
+        """Queue handler feeding a background listener that owns the file and console handlers."""
+        handlers = LoggerManager._get_handlers(config)
+        with LoggerManager._lock:
+            if LoggerManager._queue_handler is None:
+                log_queue = queue.Queue(maxsize=config.get("log_queue_size") or 0)
+                LoggerManager._queue_handler = DeferredQueueHandler(log_queue, config.get("max_payload_chars"))
+                LoggerManager._listener = logging.handlers.QueueListener(
+                    log_queue, *handlers, respect_handler_level=True
+                )
+                LoggerManager._listener.start()
+                atexit.register(LoggerManager.shutdown)
+            return LoggerManager._queue_handler
+
+    @staticmethod
+    def shutdown():
+        """Flushes queued records and stops the background writer."""
+        with LoggerManager._lock:
+            listener, LoggerManager._listener = LoggerManager._listener, None
+        if listener is not None:
+            listener.stop()
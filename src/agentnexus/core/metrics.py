@@ -0,0 +1,288 @@
+import bisect
+import os
+import threading
+import time
+
+from agentnexus.core.config_manager import ConfigManager
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    """Context manager recording a stage's duration, failures and (optionally) a span."""
+
+    __slots__ = ("metrics", "stage", "labels", "started", "span")
+
+    def __init__(self, metrics, stage: str, labels: dict):
+        self.metrics = metrics
+        self.stage = stage
+        self.labels = labels
+        self.span = None
+
+    def __enter__(self):
+        tracer = self.metrics.tracer
+        if tracer is not None:
+            self.span = tracer.start_as_current_span(self.stage, attributes=self.labels)
+            self.span.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        labels = dict(self.labels, stage=self.stage)
+        self.metrics.observe("agentnexus_stage_duration_seconds", elapsed, **labels)
+        if exc_type is not None:
+            self.metrics.inc("agentnexus_stage_errors_total", **labels)
+        if self.span is not None:
+            self.span.__exit__(exc_type, exc, tb)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NoopMetrics:
+    """Stand-in used when metrics are disabled; every call returns immediately."""
+
+    enabled = False
+    tracer = None
+    _timer = _NullTimer()
+
+    def timer(self, stage: str, **labels):
+        return self._timer
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def set_gauge(self, name: str, value: float, **labels):
+        pass
+
+    def record_usage(self, usage, **labels):
+        pass
+
+    def render(self) -> str:
+        return ""
+
+
+class Metrics(NoopMetrics):
+    """
+    In-process metrics registry: counters, gauges and latency histograms keyed by
+    name and labels, exported in the Prometheus text format (file or HTTP),
+    with optional OpenTelemetry spans around timed stages.
+    """
+
+    enabled = True
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    HELP = {
+        "agentnexus_stage_duration_seconds": "Time spent in each pipeline stage",
+        "agentnexus_stage_errors_total": "Stages that raised an exception",
+        "agentnexus_llm_tokens_total": "Tokens reported by the LLM provider",
+        "agentnexus_cache_hits_total": "Results served from a cache",
+        "agentnexus_llm_hedges_total": "LLM requests duplicated to a secondary endpoint",
+        "agentnexus_llm_hedge_wins_total": "Hedged LLM requests answered first by the secondary endpoint",
+        "agentnexus_llm_failovers_total": "LLM requests retried on the next endpoint after a failure",
+        "agentnexus_best_of_attempts_total": "Candidates DeveloperAgent generated before accepting or giving up",
+        "agentnexus_admission_queue_depth": "Requests waiting for admission",
+        "agentnexus_admission_running": "Admitted requests currently running",
+        "agentnexus_admission_wait_seconds": "Time requests spent queued before admission",
+        "agentnexus_admission_rejected_total": "Requests rejected or displaced by a full admission queue",
+        "agentnexus_admission_expired_total": "Requests whose deadline passed while queued or running",
+        "agentnexus_execution_environment_changes_total": "Interpreter environment changes seen by the execution cache",
+    }
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, tracing: bool = False):
+        self.buckets = tuple(sorted(buckets))
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.tracer = self._load_tracer() if tracing else None
+
+    @classmethod
+    def get_instance(cls):
+        """Returns the process-wide registry, or a NoopMetrics when metrics are disabled."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = ConfigManager.get_config()
+                    if config["enable_metrics"]:
+                        instance = cls(tracing=config["enable_tracing"])
+                        if config["metrics_port"]:
+                            instance.start_http_server(config["metrics_port"])
+                    else:
+                        instance = NoopMetrics()
+                    cls._instance = instance
+        return cls._instance
+
+    @staticmethod
+    def _load_tracer():
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            return None
+        return trace.get_tracer("agentnexus")
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        # Label values are kept as strings (None as "") so series keys always sort
+        return name, tuple(sorted((label, "" if value is None else str(value)) for label, value in labels.items()))
+
+    def timer(self, stage: str, **labels):
+        return _Timer(self, stage, labels)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def record_usage(self, usage, **labels):
+        """Counts prompt and completion tokens from an OpenAI-style `usage` object."""
+        if usage is None:
+            return
+        for kind in ("prompt", "completion"):
+            tokens = getattr(usage, f"{kind}_tokens", None)
+            if tokens:
+                self.inc("agentnexus_llm_tokens_total", tokens, type=kind, **labels)
+        # Prompt tokens the provider served from its prompt cache
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)
+        if cached:
+            self.inc("agentnexus_llm_tokens_total", cached, type="cached", **labels)
+
+    def snapshot(self) -> dict:
+        """Plain-dict view of every metric, e.g. for benchmarks."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: {"count": h.count, "sum": h.sum} for key, h in self._histograms.items()}
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels, extra: tuple = ()) -> str:
+        pairs = tuple(labels) + tuple(extra)
+        if not pairs:
+            return ""
+        rendered = []
+        for name, value in pairs:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            rendered.append(f'{name}="{value}"')
+        return "{" + ",".join(rendered) + "}"
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted((key, (list(h.counts), h.sum, h.count)) for key, h in self._histograms.items())
+
+        lines = []
+        last_name = None
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for (name, labels), value in series:
+                if name != last_name:
+                    lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    last_name = name
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for (name, labels), (counts, total, count) in histograms:
+            if name != last_name:
+                lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{self._format_labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str):
+        """Writes the current metrics to `path`, e.g. for node_exporter's textfile collector."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def start_http_server(self, port: int, host: str = "0.0.0.0"):
+        """Serves the metrics at http://host:port/metrics from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("content-type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+        return self._server
+
+    def stop_http_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+class PipelineStep:
+    """
+    One node of a pipeline DAG.
+    `agent` is the registered agent name (defaults to the step name) and
+    `inputs` lists the steps whose results this step consumes.
+    """
+
+    def __init__(self, name: str, agent: str = None, inputs=(), build_input=None):
+        self.name = name
+        self.agent = agent or name
+        self.inputs = tuple(inputs)
+        self.build_input = build_input
+
+    def __repr__(self):
+        return f"PipelineStep({self.name!r}, agent={self.agent!r}, inputs={self.inputs!r})"
+
+
+class PipelineDAG:
+    """Validated pipeline spec: steps with declared inputs, checked for unknown inputs and cycles."""
+
+    def __init__(self, steps: list):
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate pipeline step: {step.name}")
+            self.steps[step.name] = step
+
+        self.dependents = {name: [] for name in self.steps}
+        for step in self.steps.values():
+            for upstream in step.inputs:
+                if upstream not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {upstream}")
+                self.dependents[upstream].append(step.name)
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list:
+        remaining = {name: len(step.inputs) for name, step in self.steps.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for child in self.dependents[name]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.steps):
+            cycle = sorted(set(self.steps) - set(order))
+            raise ValueError(f"Pipeline contains a cycle between steps: {cycle}")
+        return order
+
+    @classmethod
+    def from_sequence(cls, agent_sequence: list):
+        """Linear chain where each agent consumes the previous agent's result."""
+        steps = []
+        for index, agent_name in enumerate(agent_sequence):
+            inputs = (agent_sequence[index - 1],) if index else ()
+            steps.append(PipelineStep(agent_name, inputs=inputs))
+        return cls(steps)
+
+    @classmethod
+    def from_spec(cls, spec: dict):
+        """Builds a DAG from {step_name: [input_step, ...]} or {step_name: {"agent": ..., "inputs": [...]}}."""
+        steps = []
+        for name, value in spec.items():
+            if isinstance(value, dict):
+                steps.append(PipelineStep(name, agent=value.get("agent"), inputs=value.get("inputs", ())))
+            else:
+                steps.append(PipelineStep(name, inputs=value))
+        return cls(steps)
+
+    def step_input(self, step: PipelineStep, task: str, context: dict) -> str:
+        """Builds the task text for `step` from the original task and its upstream results."""
+        upstream = {name: context[name] for name in step.inputs}
+        if step.build_input:
+            return step.build_input(task, upstream)
+        if not upstream:
+            return task
+        sections = [task]
+        for name, output in upstream.items():
+            result = output.get("result") if isinstance(output, dict) else output
+            sections.append(f"[{name}]\n{json.dumps(result, default=str, indent=2)}")
+        return "\n\n".join(sections)
+
+
+class DAGScheduler:
+    """
+    Runs a PipelineDAG: independent branches run concurrently, results flow
+    downstream, and the first error (or a cancellation) stops new steps
+    from starting. Steps that never ran are reported as skipped.
+    """
+
+    def __init__(self, dag: PipelineDAG):
+        self.dag = dag
+
+    @staticmethod
+    def _is_error(output) -> bool:
+        return not isinstance(output, dict) or output.get("status") == "error"
+
+    def _skipped(self, context: dict, reason: str) -> dict:
+        for name in self.dag.order:
+            if name not in context:
+                context[name] = {"status": "skipped", "result": reason}
+        return context
+
+    def _release(self, name: str, remaining: dict, ready: list):
+        for child in self.dag.dependents[name]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(self.dag.steps[child])
+
+    def run(self, task: str, run_step, max_workers: int = None, cancel_event: threading.Event = None) -> dict:
+        """Runs the DAG on threads; `run_step(agent_name, task)` returns the agent output."""
+        context = {}
+        remaining = {name: len(step.inputs) for name, step in self.dag.steps.items()}
+        ready = [self.dag.steps[name] for name in self.dag.order if remaining[name] == 0]
+        running = {}
+        stop_reason = None
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or len(self.dag.steps) or 1)
+        try:
+            while ready or running:
+                if cancel_event is not None and cancel_event.is_set():
+                    stop_reason = stop_reason or "Pipeline cancelled"
+                while ready and stop_reason is None:
+                    step = ready.pop(0)
+                    step_task = self.dag.step_input(step, task, context)
+                    running[executor.submit(run_step, step.agent, step_task)] = step
+                if not running:
+                    break
+
+                done, _ = wait(running, timeout=0.1 if cancel_event is not None else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        output = {"status": "error", "result": str(e)}
+                    context[step.name] = output
+                    if self._is_error(output):
+                        stop_reason = stop_reason or f"Upstream step '{step.name}' failed"
+                    else:
+                        self._release(step.name, remaining, ready)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return self._skipped(context, stop_reason or "Not run")
+
+    async def arun(self, task: str, run_step, cancel_event: asyncio.Event = None) -> dict:
+        """Runs the DAG on the event loop; `run_step(agent_name, task)` is a coroutine function."""
+        context = {}
+        remaining = {name: len(step.inputs) for name, step in self.dag.steps.items()}
+        ready = [self.dag.steps[name] for name in self.dag.order if remaining[name] == 0]
+        running = {}
+        stop_reason = None
+        cancel_waiter = asyncio.ensure_future(cancel_event.wait()) if cancel_event is not None else None
+
+        try:
+            while ready or running:
+                while ready and stop_reason is None:
+                    step = ready.pop(0)
+                    step_task = self.dag.step_input(step, task, context)
+                    running[asyncio.ensure_future(run_step(step.agent, step_task))] = step
+                if not running:
+                    break
+
+                waiting = set(running)
+                if cancel_waiter is not None:
+                    waiting.add(cancel_waiter)
+                done, _ = await asyncio.wait(waiting, return_when=FIRST_COMPLETED)
+
+                if cancel_waiter is not None and cancel_waiter in done:
+                    stop_reason = "Pipeline cancelled"
+                    break
+
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        output = {"status": "error", "result": str(e)}
+                    context[step.name] = output
+                    if self._is_error(output):
+                        stop_reason = f"Upstream step '{step.name}' failed"
+                    else:
+                        self._release(step.name, remaining, ready)
+
+                if stop_reason is not None:
+                    break
+        finally:
+            # Short-circuit: in-flight siblings are cancelled, not awaited to completion
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            if cancel_waiter is not None:
+                cancel_waiter.cancel()
+
+        return self._skipped(context, stop_reason or "Not run")
@@ -0,0 +1,133 @@
+import hashlib
+import math
+import re
+import threading
+from functools import lru_cache
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+
+class PromptBudget:
+    """
+    Builds chat messages in a provider-cache-friendly order and keeps them
+    within a token budget.
+
+    Messages are always laid out as system prompt, prior context (oldest
+    first), then the user prompt, so the long fixed system prompt is a
+    byte-identical prefix on every call and provider-side prompt caching
+    can reuse it. When `max_prompt_tokens` is set, over-long requests are
+    compacted, the oldest context is dropped, and finally the user prompt
+    is cut in the middle. Tokens are counted with tiktoken when it is
+    installed, otherwise estimated from the character count.
+    """
+
+    CHARS_PER_TOKEN = 4
+    # Role and framing tokens the chat format adds to every message
+    MESSAGE_OVERHEAD = 4
+    TRIM_MARKER = "\n...[{} tokens trimmed]...\n"
+
+    def __init__(self, max_prompt_tokens: int = None, encoding: str = None):
+        config = ConfigManager.get_config()
+        self.max_prompt_tokens = max_prompt_tokens if max_prompt_tokens is not None else config["max_prompt_tokens"]
+        self.encoding_name = encoding or config["tokenizer_encoding"]
+        self.logger = LoggerManager.get_logger("PromptBudget")
+        self._encoding = None
+        self._encoding_lock = threading.Lock()
+        # System prompts repeat on every call; count each one once
+        self.count_static = lru_cache(maxsize=64)(self.count)
+
+    def _get_encoding(self):
+        """The tiktoken encoding, or False when tiktoken (or its BPE file) is unavailable."""
+        if self._encoding is None:
+            with self._encoding_lock:
+                if self._encoding is None:
+                    try:
+                        import tiktoken
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as e:
+                        self.logger.info("[PromptBudget] tiktoken unavailable (%s); estimating tokens from length", e)
+                        self._encoding = False
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding:
+            return len(encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / self.CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Keeps the head and tail of `text` within `max_tokens`, marking what was cut from the middle."""
+        total = self.count(text)
+        if total <= max_tokens:
+            return text
+        marker = self.TRIM_MARKER.format(total - max_tokens)
+        keep = max(0, max_tokens - self.count(marker))
+        # The start of a prompt usually states the task; give it the larger share
+        head, tail = keep * 2 // 3, keep - keep * 2 // 3
+        encoding = self._get_encoding()
+        if encoding:
+            tokens = encoding.encode(text, disallowed_special=())
+            return encoding.decode(tokens[:head]) + marker + (encoding.decode(tokens[-tail:]) if tail else "")
+        head, tail = head * self.CHARS_PER_TOKEN, tail * self.CHARS_PER_TOKEN
+        return text[:head] + marker + (text[-tail:] if tail else "")
+
+    @staticmethod
+    def compact(text: str) -> str:
+        """Drops trailing whitespace and collapses runs of blank lines."""
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+    @staticmethod
+    def prefix_key(system_prompt: str) -> str:
+        """Short stable id of a system prompt, used to route requests sharing it to the same provider cache."""
+        return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _as_messages(context) -> list:
+        if not context:
+            return []
+        if isinstance(context, str):
+            context = [context]
+        return [item if isinstance(item, dict) else {"role": "user", "content": str(item)} for item in context]
+
+    def estimate(self, messages: list) -> int:
+        """Prompt tokens of a message list; the first (system) message is counted through the cache."""
+        total = 0
+        for index, message in enumerate(messages):
+            content = message.get("content") or ""
+            total += (self.count_static(content) if index == 0 else self.count(content)) + self.MESSAGE_OVERHEAD
+        return total
+
+    def build_messages(self, system_prompt: str, prompt: str, context=None) -> list:
+        """
+        Returns [system, *context, user] within the budget. `context` is a list
+        of prior messages (dicts, or strings sent as user messages).
+        """
+        context = self._as_messages(context)
+        messages = [{"role": "system", "content": system_prompt}, *context, {"role": "user", "content": prompt}]
+        if not self.max_prompt_tokens or self.estimate(messages) <= self.max_prompt_tokens:
+            return messages
+
+        available = self.max_prompt_tokens - self.count_static(system_prompt) - 2 * self.MESSAGE_OVERHEAD
+        if available <= 0:
+            raise ValueError(f"System prompt alone exceeds max_prompt_tokens ({self.max_prompt_tokens})")
+
+        prompt = self.compact(prompt)
+        context = [dict(message, content=self.compact(message.get("content") or "")) for message in context]
+        sizes = [self.count(message["content"]) + self.MESSAGE_OVERHEAD for message in context]
+        prompt_tokens = self.count(prompt)
+
+        dropped = 0
+        while context and prompt_tokens + sum(sizes) > available:
+            context.pop(0)
+            sizes.pop(0)
+            dropped += 1
+        if prompt_tokens > available:
+            prompt = self.truncate(prompt, available)
+
+        self.logger.info("[PromptBudget] Trimmed request to %s tokens: dropped %s context messages, prompt %s",
+                         self.max_prompt_tokens, dropped,
+                         "truncated" if prompt_tokens > available else "kept")
+        return [{"role": "system", "content": system_prompt}, *context, {"role": "user", "content": prompt}]
@@ -0,0 +1,315 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Takes `amount` tokens if available. Returns 0, or the seconds to wait before retrying."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount: float = 1):
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1):
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def adjust(self, delta: float):
+        """Refunds (positive) or charges (negative) tokens once the real cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit: grows by 1/limit per healthy call and is cut by
+    `backoff` on overload (429s or latency above `latency_target`).
+    """
+
+    def __init__(self, initial: int = 16, min_limit: int = 1, max_limit: int = 256,
+                 latency_target: float = None, backoff: float = 0.5, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Returns None when a slot was taken, otherwise a Future resolved once one frees up."""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                return None
+            waiter = Future()
+            self._waiters.append(waiter)
+            return waiter
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.set_running_or_notify_cancel():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def acquire(self):
+        waiter = self._reserve()
+        if waiter is not None:
+            waiter.result()
+
+    async def aacquire(self):
+        waiter = self._reserve()
+        if waiter is None:
+            return
+        try:
+            await asyncio.wrap_future(waiter)
+        except asyncio.CancelledError:
+            # The slot may have been granted just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def on_success(self, latency: float):
+        if self.latency_target and latency > self.latency_target:
+            self.on_overload()
+            return
+        with self._lock:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_overload(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+
+
+class LLMGovernor:
+    """
+    Process-wide client-side governor for LLM calls.
+    Combines request and token buckets, an adaptive concurrency limit and
+    jittered retries that honour Retry-After.
+    """
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+    OVERLOAD_STATUS = {429, 503}
+
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None,
+                 max_concurrency: int = None, initial_concurrency: int = 16, min_concurrency: int = 1,
+                 latency_target: float = None, max_retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=min(initial_concurrency, max_concurrency),
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+            latency_target=latency_target
+        ) if max_concurrency else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+        self.logger = LoggerManager.get_logger("LLMGovernor")
+
+    @classmethod
+    def get_instance(cls, name: str = "default"):
+        """Returns the governor shared by every agent for `name`, building it from ConfigManager."""
+        with cls._lock:
+            if name not in cls._instances:
+                config = ConfigManager.get_config()
+                cls._instances[name] = cls(
+                    requests_per_minute=config["requests_per_minute"],
+                    tokens_per_minute=config["tokens_per_minute"],
+                    max_concurrency=config["max_concurrency"],
+                    initial_concurrency=config["initial_concurrency"],
+                    latency_target=config["latency_target"],
+                    max_retries=config["max_retries"],
+                    base_delay=config["retry_base_delay"],
+                    max_delay=config["retry_max_delay"]
+                )
+            return cls._instances[name]
+
+    @staticmethod
+    def retry_after(error: Exception):
+        """Reads Retry-After (seconds or HTTP date) from a provider error, if present."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        value = headers.get("retry-after-ms")
+        if value:
+            try:
+                return float(value) / 1000.0
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    def retry_delay(self, attempt: int, retry_after: float = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """Dropped connections and timeouts carry no status code but are as transient as a 503."""
+        try:
+            import openai
+        except ImportError:
+            return False
+        # APITimeoutError is a subclass of APIConnectionError
+        return isinstance(error, openai.APIConnectionError)
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        status = getattr(error, "status_code", None)
+        if attempt >= self.max_retries:
+            return False
+        if status not in self.RETRYABLE_STATUS and not self._is_connection_error(error):
+            return False
+        if status in self.OVERLOAD_STATUS:
+            self.throttled += 1
+            if self.limiter:
+                self.limiter.on_overload()
+        self.retries += 1
+        return True
+
+    def _record_usage(self, response, estimated_tokens: int):
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if self.token_bucket and total is not None:
+            self.token_bucket.adjust(estimated_tokens - total)
+
+    def call(self, fn, estimated_tokens: int = 0):
+        """Runs `fn` under the governor, retrying throttled or transient failures."""
+        attempt = 0
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket:
+                self.token_bucket.acquire(estimated_tokens)
+            if self.limiter:
+                self.limiter.acquire()
+            error = None
+            started = time.monotonic()
+            try:
+                response = fn()
+            except Exception as e:
+                error = e
+            finally:
+                if self.limiter:
+                    self.limiter.release()
+
+            if error is not None:
+                if not self._should_retry(error, attempt):
+                    raise error
+                delay = self.retry_delay(attempt, self.retry_after(error))
+                self.logger.warning("[LLMGovernor] Retrying in %.2fs after: %s", delay, error)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.limiter:
+                self.limiter.on_success(time.monotonic() - started)
+            self._record_usage(response, estimated_tokens)
+            return response
+
+    async def acall(self, fn, estimated_tokens: int = 0):
+        """Async counterpart of call; `fn` returns an awaitable."""
+        attempt = 0
+        while True:
+            if self.request_bucket:
+                await self.request_bucket.aacquire(1)
+            if self.token_bucket:
+                await self.token_bucket.aacquire(estimated_tokens)
+            if self.limiter:
+                await self.limiter.aacquire()
+            error = None
+            started = time.monotonic()
+            try:
+                response = await fn()
+            except Exception as e:
+                error = e
+            finally:
+                if self.limiter:
+                    self.limiter.release()
+
+            if error is not None:
+                if not self._should_retry(error, attempt):
+                    raise error
+                delay = self.retry_delay(attempt, self.retry_after(error))
+                self.logger.warning("[LLMGovernor] Retrying in %.2fs after: %s", delay, error)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.limiter:
+                self.limiter.on_success(time.monotonic() - started)
+            self._record_usage(response, estimated_tokens)
+            return response
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "concurrency_limit": int(self.limiter.limit) if self.limiter else None,
+            "in_flight": self.limiter.in_flight if self.limiter else None
+        }
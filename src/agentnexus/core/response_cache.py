@@ -0,0 +1,163 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+
+class ResponseCache:
+    """
+    Content-addressed cache with an in-memory LRU tier and an optional SQLite tier.
+    Entries expire after `ttl` seconds (None or 0 disables expiry).
+    """
+
+    DISK_EVICTION_INTERVAL = 64
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600,
+                 path: str = None, max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.logger = LoggerManager.get_logger("ResponseCache")
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_writes = 0
+
+        if path:
+            self._open_disk(path)
+
+    @classmethod
+    def from_config(cls):
+        """Builds a cache from ConfigManager, or returns None when caching is disabled."""
+        config = ConfigManager.get_config()
+        if not config.get("enable_cache"):
+            return None
+        return cls(
+            max_entries=config["cache_max_entries"],
+            ttl=config["cache_ttl"],
+            path=config["cache_path"],
+            max_disk_entries=config["cache_max_disk_entries"]
+        )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hashes the full request so that any change in its parts yields a new key."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _open_disk(self, path: str):
+        import sqlite3
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+
+    def _expiry(self, now: float):
+        return now + self.ttl if self.ttl else None
+
+    def get(self, key: str):
+        """Returns the cached value for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._store_memory(key, value, expires_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """Stores `value` in the memory tier and, if configured, the disk tier."""
+        now = time.time()
+        expires_at = self._expiry(now)
+        with self._lock:
+            self._store_memory(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                self._disk_writes += 1
+                if self._disk_writes % self.DISK_EVICTION_INTERVAL == 0:
+                    self._evict_disk(now)
+
+    def _store_memory(self, key: str, value: str, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self, now: float):
+        self._db.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += overflow
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory)
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent calls with the same key share one execution.
+    Sync and async callers share the same in-flight table, so a thread can
+    wait on a call started by a coroutine and vice versa.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._tasks = {}
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def _join(self, key: str):
+        """Returns (future, is_leader) for `key`."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            # Marked running so a cancelled waiter cannot cancel it for everyone else
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result=None, error: BaseException = None):
+        with self._lock:
+            if self._calls.get(key) is future:
+                self._calls.pop(key)
+                self._tasks.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn):
+        """Runs `fn()` once for all concurrent callers with the same key."""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: str, fn, cancel_orphaned: bool = False):
+        """
+        Async counterpart of do; `fn` returns an awaitable. With
+        `cancel_orphaned`, the shared call is cancelled once every caller
+        waiting on it has been cancelled.
+        """
+        future, leader = self._join(key)
+        if leader:
+            # Run the shared call as its own task so cancelling the leader does not fail the followers
+            task = asyncio.ensure_future(fn())
+            with self._lock:
+                if self._calls.get(key) is future:
+                    self._tasks[key] = task
+
+            def _resolve(done):
+                if done.cancelled():
+                    self._finish(key, future, error=asyncio.CancelledError())
+                elif done.exception() is not None:
+                    self._finish(key, future, error=done.exception())
+                else:
+                    self._finish(key, future, result=done.result())
+
+            task.add_done_callback(_resolve)
+        if not cancel_orphaned:
+            return await asyncio.wrap_future(future)
+
+        with self._lock:
+            self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            orphaned = None
+            with self._lock:
+                remaining = self._waiters.pop(future) - 1
+                if remaining:
+                    self._waiters[future] = remaining
+                elif not future.done() and self._calls.get(key) is future:
+                    # Later callers start a fresh call instead of joining the cancelled one
+                    self._calls.pop(key)
+                    orphaned = self._tasks.pop(key, None)
+            if orphaned is not None:
+                orphaned.get_loop().call_soon_threadsafe(orphaned.cancel)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        return {"leaders": self.leaders, "shared": self.shared, "in_flight": self.in_flight()}
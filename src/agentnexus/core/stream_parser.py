@@ -0,0 +1,241 @@
+import ast
+import json
+import re
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for the flat JSON objects returned by the LLM.
+    Top-level string fields are decoded as they arrive, so callers can act
+    on a field (e.g. `content_type`) before the completion has finished.
+    Non-string values are buffered and decoded once complete.
+    """
+
+    _STRING_STOP = re.compile(r'["\\]')
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    BEFORE_OBJECT, EXPECT_KEY, IN_KEY, EXPECT_COLON, EXPECT_VALUE, IN_STRING, IN_VALUE, AFTER_VALUE, DONE = range(9)
+
+    def __init__(self):
+        self.fields = {}
+        self.completed = set()
+        self.state = self.BEFORE_OBJECT
+        self._key = None
+        self._buffer = []
+        self._escape = None
+        self._pending_surrogate = None
+        self._depth = 0
+        self._nested_string = False
+        self._nested_escape = False
+
+    @property
+    def done(self) -> bool:
+        return self.state == self.DONE
+
+    def is_complete(self, key: str) -> bool:
+        return key in self.completed
+
+    def feed(self, chunk: str) -> list:
+        """
+        Consumes `chunk` and returns the updates it produced as
+        (key, delta, complete) tuples; `delta` is the newly decoded text for
+        string fields and the whole value for other types.
+        """
+        events = []
+        i, n = 0, len(chunk)
+        while i < n:
+            state = self.state
+
+            if state == self.IN_STRING or state == self.IN_KEY:
+                i = self._consume_string(chunk, i, events)
+                continue
+
+            c = chunk[i]
+            if state == self.IN_VALUE:
+                i = self._consume_value(chunk, i, events)
+                continue
+
+            i += 1
+            if c.isspace():
+                continue
+            if state == self.BEFORE_OBJECT:
+                if c == "{":
+                    self.state = self.EXPECT_KEY
+            elif state == self.EXPECT_KEY:
+                if c == '"':
+                    self.state = self.IN_KEY
+                    self._buffer = []
+                elif c == "}":
+                    self.state = self.DONE
+            elif state == self.EXPECT_COLON:
+                if c == ":":
+                    self.state = self.EXPECT_VALUE
+            elif state == self.EXPECT_VALUE:
+                if c == '"':
+                    self.state = self.IN_STRING
+                    self.fields[self._key] = ""
+                else:
+                    self.state = self.IN_VALUE
+                    self._buffer = [c]
+                    self._depth = 1 if c in "{[" else 0
+                    self._nested_string = False
+                    self._nested_escape = False
+            elif state == self.AFTER_VALUE:
+                if c == ",":
+                    self.state = self.EXPECT_KEY
+                elif c == "}":
+                    self.state = self.DONE
+            elif state == self.DONE:
+                break
+        return events
+
+    def _decode_escape(self, seq: str) -> str:
+        if seq[0] != "u":
+            return self._ESCAPES.get(seq, seq)
+        code = int(seq[1:], 16)
+        if 0xD800 <= code < 0xDC00:
+            self._pending_surrogate = code
+            return ""
+        if 0xDC00 <= code < 0xE000 and self._pending_surrogate is not None:
+            high, self._pending_surrogate = self._pending_surrogate, None
+            return chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00))
+        return chr(code)
+
+    def _consume_string(self, chunk: str, i: int, events: list) -> int:
+        decoded = []
+        n = len(chunk)
+        while i < n:
+            if self._escape is not None:
+                self._escape += chunk[i]
+                i += 1
+                if self._escape[0] == "u" and len(self._escape) < 5:
+                    continue
+                decoded.append(self._decode_escape(self._escape))
+                self._escape = None
+                continue
+
+            match = self._STRING_STOP.search(chunk, i)
+            end = match.start() if match else n
+            if end > i:
+                decoded.append(chunk[i:end])
+            i = end
+            if match is None:
+                break
+            i += 1
+            if match.group() == "\\":
+                self._escape = ""
+                continue
+
+            # Closing quote
+            text = "".join(decoded)
+            if self.state == self.IN_KEY:
+                self._buffer.append(text)
+                self._key = "".join(self._buffer)
+                self.state = self.EXPECT_COLON
+            else:
+                self.fields[self._key] += text
+                self.completed.add(self._key)
+                events.append((self._key, text, True))
+                self.state = self.AFTER_VALUE
+            return i
+
+        text = "".join(decoded)
+        if self.state == self.IN_KEY:
+            self._buffer.append(text)
+        elif text:
+            self.fields[self._key] += text
+            events.append((self._key, text, False))
+        return i
+
+    def _consume_value(self, chunk: str, i: int, events: list) -> int:
+        n = len(chunk)
+        while i < n:
+            c = chunk[i]
+            if self._depth == 0 and (c in ",}" or c.isspace()):
+                self._finish_value(events)
+                return i
+            i += 1
+            self._buffer.append(c)
+            if self._nested_string:
+                if self._nested_escape:
+                    self._nested_escape = False
+                elif c == "\\":
+                    self._nested_escape = True
+                elif c == '"':
+                    self._nested_string = False
+            elif c == '"':
+                self._nested_string = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(events)
+                    return i
+        return i
+
+    def _finish_value(self, events: list):
+        raw = "".join(self._buffer)
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        self.fields[self._key] = value
+        self.completed.add(self._key)
+        events.append((self._key, value, True))
+        self.state = self.AFTER_VALUE
+
+
+class IncrementalSyntaxCheck:
+    """
+    Syntax pre-check of Python code that is still streaming in.
+
+    Only complete lines are parsed, at newline boundaries and only once the
+    code has grown by half since the previous parse, so the total work stays
+    linear in the length of the code. A syntax error before the last
+    non-blank line cannot be repaired by text that arrives later (except an
+    unclosed bracket or triple-quoted string), so `failed` is set as soon as
+    one is seen.
+    """
+
+    GROWTH = 1.5
+    MIN_PARSE_CHARS = 256
+    _REPAIRABLE = ("was never closed", "unterminated triple-quoted")
+
+    def __init__(self):
+        self.failed = False
+        self.error = None
+        self._parts = []
+        self._length = 0
+        self._next_check = self.MIN_PARSE_CHARS
+
+    def feed(self, delta: str) -> bool:
+        """Adds streamed code; returns True once the code is known not to parse."""
+        if self.failed or not delta:
+            return self.failed
+        self._parts.append(delta)
+        self._length += len(delta)
+        if "\n" in delta and self._length >= self._next_check:
+            self._check()
+        return self.failed
+
+    def _check(self):
+        code = "".join(self._parts)
+        self._parts = [code]
+        self._next_check = max(self.MIN_PARSE_CHARS, int(len(code) * self.GROWTH))
+
+        lines = code[:code.rfind("\n")].split("\n")
+        # Markdown fences are stripped before the final parse; blank them here to keep line numbers
+        if lines[0].lstrip().startswith("```"):
+            lines[0] = ""
+        for index, line in enumerate(lines[1:], 1):
+            if line.lstrip().startswith("```"):
+                del lines[index:]
+                break
+        last_line = max((index + 1 for index, line in enumerate(lines) if line.strip()), default=0)
+        try:
+            ast.parse("\n".join(lines))
+        except SyntaxError as e:
+            if e.lineno is not None and e.lineno < last_line and \
+                    not any(message in (e.msg or "") for message in self._REPAIRABLE):
+                self.failed = True
+                self.error = f"line {e.lineno}: {e.msg}"
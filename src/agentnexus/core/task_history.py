@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from agentnexus.core.config_manager import ConfigManager
+
+class TaskRecord:
+    """One executed task. Uses __slots__ so large histories stay compact."""
+
+    __slots__ = ("agent", "task", "status", "output", "created_at")
+
+    def __init__(self, agent: str, task: str, status: str, output, created_at: float = None):
+        self.agent = agent
+        self.task = task
+        self.status = status
+        self.output = output
+        self.created_at = created_at if created_at is not None else time.time()
+
+    def matches(self, agent: str = None, status: str = None, since: float = None, until: float = None) -> bool:
+        return ((agent is None or self.agent == agent)
+                and (status is None or self.status == status)
+                and (since is None or self.created_at >= since)
+                and (until is None or self.created_at < until))
+
+    def to_dict(self) -> dict:
+        return {
+            "agent": self.agent,
+            "task": self.task,
+            "status": self.status,
+            "output": self.output,
+            "created_at": self.created_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data.get("agent"), data.get("task"), data.get("status"), data.get("output"),
+                   data.get("created_at"))
+
+
+class JSONLHistoryLog:
+    """Append-only JSON Lines log; queries stream the file line by line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, record: TaskRecord):
+        line = json.dumps(record.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def query(self, agent: str = None, status: str = None, since: float = None, until: float = None):
+        with open(self.path, encoding="utf-8") as log_file:
+            for line in log_file:
+                if not line.strip():
+                    continue
+                try:
+                    record = TaskRecord.from_dict(json.loads(line))
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    continue
+                if record.matches(agent, status, since, until):
+                    yield record
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SQLiteHistoryLog:
+    """Append-only SQLite log with indexes on agent, status and time."""
+
+    PAGE_SIZE = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        import sqlite3
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS task_history ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, agent TEXT, task TEXT, status TEXT, "
+            "output TEXT, created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_history_agent ON task_history(agent, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_history_status ON task_history(status, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_history_created ON task_history(created_at)")
+
+    def append(self, record: TaskRecord):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO task_history (agent, task, status, output, created_at) VALUES (?, ?, ?, ?, ?)",
+                (record.agent, record.task, record.status,
+                 json.dumps(record.output, ensure_ascii=False, default=str), record.created_at)
+            )
+
+    def query(self, agent: str = None, status: str = None, since: float = None, until: float = None):
+        clauses, params = [], []
+        for clause, value in (("agent = ?", agent), ("status = ?", status),
+                              ("created_at >= ?", since), ("created_at < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        # Keyset pagination keeps only one page of rows in memory at a time
+        last_id = 0
+        while True:
+            where = " AND ".join(clauses + ["id > ?"])
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT id, agent, task, status, output, created_at FROM task_history "
+                    f"WHERE {where} ORDER BY id LIMIT ?",
+                    (*params, last_id, self.PAGE_SIZE)
+                ).fetchall()
+            for row_id, row_agent, task, row_status, output, created_at in rows:
+                last_id = row_id
+                yield TaskRecord(row_agent, task, row_status, json.loads(output), created_at)
+            if len(rows) < self.PAGE_SIZE:
+                return
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class TaskHistory:
+    """
+    Bounded task history: the most recent `capacity` records are kept in a
+    ring buffer, and every record is optionally appended to an on-disk log
+    (JSONL or SQLite) that queries read from instead when present.
+    """
+
+    _logs = {}
+    _logs_lock = threading.Lock()
+
+    def __init__(self, capacity: int = 1000, path: str = None, backend: str = None):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.log = self.open_log(path, backend) if path else None
+
+    @classmethod
+    def from_config(cls, persistent: bool = True):
+        """Builds a history from ConfigManager; `persistent=False` skips the on-disk log."""
+        config = ConfigManager.get_config()
+        return cls(
+            capacity=config["history_capacity"],
+            path=config["history_path"] if persistent else None,
+            backend=config["history_backend"]
+        )
+
+    @classmethod
+    def open_log(cls, path: str, backend: str = None):
+        """Returns the shared log for `path`, so every history writing to it appends through one handle."""
+        if backend is None:
+            backend = "jsonl" if path.endswith((".jsonl", ".json")) else "sqlite"
+        if backend not in ("jsonl", "sqlite"):
+            raise ValueError(f"Unknown task history backend: {backend}")
+        with cls._logs_lock:
+            log = cls._logs.get(path)
+            if log is None:
+                log = JSONLHistoryLog(path) if backend == "jsonl" else SQLiteHistoryLog(path)
+                cls._logs[path] = log
+            return log
+
+    def record(self, agent: str, task: str, output) -> TaskRecord:
+        status = output.get("status") if isinstance(output, dict) else None
+        record = TaskRecord(agent, task, status, output)
+        with self._lock:
+            self._records.append(record)
+        if self.log is not None:
+            self.log.append(record)
+        return record
+
+    def query(self, agent: str = None, status: str = None, since: float = None, until: float = None):
+        """Yields matching records, oldest first."""
+        if self.log is not None:
+            yield from self.log.query(agent, status, since, until)
+            return
+        with self._lock:
+            records = list(self._records)
+        for record in records:
+            if record.matches(agent, status, since, until):
+                yield record
+
+    def pages(self, page_size: int = 100, **filters):
+        """Yields lists of at most `page_size` record dicts; nothing is read ahead of the caller."""
+        page = []
+        for record in self.query(**filters):
+            page.append(record.to_dict())
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def recent(self, limit: int = None) -> list:
+        """The newest in-memory records, newest last."""
+        with self._lock:
+            records = list(self._records)
+        return records[-limit:] if limit else records
+
+    def clear(self):
+        """Drops the in-memory records; the on-disk log is append-only and left untouched."""
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self.recent())
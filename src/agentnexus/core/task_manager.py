@@ -1,18 +1,27 @@
 from agentnexus.agents.base_agent import BaseAgent
+from agentnexus.core.agent_pool import AgentPool
 
 class TaskManager(BaseAgent):
 
     def __init__(self):
         self.agents = {}
+        self.pools = {}
     
-    def register_agent(self, agent_name: str, agent_class: type):
+    def register_agent(self, agent_name: str, agent_class: type, pool_size: int = None, warm_up: bool = None):
+        """Registers an agent class with a pool of its instances, built on first use unless `warm_up` is set."""
         if not issubclass(agent_class, BaseAgent):
             raise ValueError("Agent must be a subclass of BaseAgent")
         self.agents[agent_name] = agent_class
+        self.pools[agent_name] = AgentPool(agent_class, size=pool_size, warm_up=warm_up, name=agent_name)
 
     def execute_task(self, agent_name: str, task: str):
         if agent_name not in self.agents:
             raise ValueError(f"Agent {agent_name} not found")
         
-        agent_instance = self.agents[agent_name]()
-        return agent_instance.execute(task)
\ No newline at end of file
+        return self.pools[agent_name].execute(task)
+
+    async def aexecute_task(self, agent_name: str, task: str):
+        if agent_name not in self.agents:
+            raise ValueError(f"Agent {agent_name} not found")
+
+        return await self.pools[agent_name].aexecute(task)
@@ -0,0 +1,139 @@
+import re
+import threading
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.response_cache import ResponseCache
+
+class TaskRouter:
+    """
+    Maps tasks to agent sequences (plans), a whole batch at a time.
+
+    Tasks are routed by keyword rules, each compiled into one regular
+    expression alternation, or, once `fit` has been called, by a linear
+    model over hashed character n-grams that classifies the batch in one
+    sparse matrix product (scikit-learn); predictions below
+    `min_confidence` fall back to the rules. Model routes of recently seen
+    tasks are kept in an LRU cache keyed on the normalized task text; the
+    rules are cheaper than a cache lookup and are not cached.
+    """
+
+    PLANS = {
+        "build": ["developer", "validator", "tester", "auditor"],
+        "test": ["tester", "auditor"],
+        "develop": ["developer", "validator"]
+    }
+    # Checked in order; the first rule with a matching keyword wins
+    RULES = [
+        ("build", ("build", "create")),
+        ("test", ("test",))
+    ]
+    DEFAULT_ROUTE = "develop"
+
+    def __init__(self, plans: dict = None, rules: list = None, default_route: str = None,
+                 cache_size: int = None, min_confidence: float = None):
+        config = ConfigManager.get_config()
+        self.plans = plans or self.PLANS
+        self.rules = rules or self.RULES
+        self.default_route = default_route or self.DEFAULT_ROUTE
+        self.min_confidence = min_confidence if min_confidence is not None else config["router_min_confidence"]
+        cache_size = cache_size if cache_size is not None else config["router_cache_size"]
+        self.cache = ResponseCache(max_entries=cache_size, ttl=None) if cache_size else None
+        self.logger = LoggerManager.get_logger("TaskRouter")
+        self._patterns = [(route, re.compile("|".join(map(re.escape, keywords)))) for route, keywords in self.rules]
+        self.vectorizer = None
+        self.model = None
+        self._model_lock = threading.Lock()
+
+        unknown = {route for route, _ in self.rules} - set(self.plans) | ({self.default_route} - set(self.plans))
+        if unknown:
+            raise ValueError(f"Routes without a plan: {', '.join(sorted(unknown))}")
+
+    @staticmethod
+    def normalize(task: str) -> str:
+        return " ".join(str(task or "").split()).lower()
+
+    def fit(self, tasks: list, routes: list):
+        """Trains the n-gram model on labelled tasks; requires scikit-learn."""
+        try:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            from sklearn.linear_model import LogisticRegression
+        except ImportError:
+            raise ValueError("TaskRouter.fit requires the 'scikit-learn' package")
+        unknown = set(routes) - set(self.plans)
+        if unknown:
+            raise ValueError(f"Routes without a plan: {', '.join(sorted(unknown))}")
+
+        # Hashing needs no vocabulary, so the model stays small and routing allocates nothing per term
+        vectorizer = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), n_features=2 ** 18,
+                                       alternate_sign=False, norm="l2")
+        model = LogisticRegression(max_iter=1000)
+        model.fit(vectorizer.transform([self.normalize(task) for task in tasks]), list(routes))
+        with self._model_lock:
+            self.vectorizer, self.model = vectorizer, model
+        if self.cache is not None:
+            # Cached routes came from the previous model
+            self.cache.clear()
+        self.logger.info("[TaskRouter] Trained routing model on %s tasks", len(tasks))
+        return self
+
+    def _keyword_routes(self, texts: list) -> list:
+        return [self._keyword_route(text) for text in texts]
+
+    def _keyword_route(self, text: str) -> str:
+        for route, pattern in self._patterns:
+            if pattern.search(text):
+                return route
+        return self.default_route
+
+    def _model_routes(self, texts: list) -> list:
+        with self._model_lock:
+            vectorizer, model = self.vectorizer, self.model
+        probabilities = model.predict_proba(vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        confident = probabilities.max(axis=1) >= self.min_confidence
+        routes = model.classes_[best].tolist()
+        uncertain = [i for i, ok in enumerate(confident) if not ok]
+        if uncertain:
+            for i, route in zip(uncertain, self._keyword_routes([texts[i] for i in uncertain])):
+                routes[i] = route
+        return routes
+
+    def route_many(self, tasks: list) -> list:
+        """Returns the route name of every task, in order."""
+        texts = [self.normalize(task) for task in tasks]
+        if self.model is None:
+            return self._keyword_routes(texts)
+
+        cache = self.cache
+        routes = [None] * len(texts)
+        missing = {}
+        for i, text in enumerate(texts):
+            cached = cache.get(text) if cache is not None else None
+            if cached is not None:
+                routes[i] = cached
+            else:
+                # Duplicates within the batch are classified once
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            unique = list(missing)
+            for text, route in zip(unique, self._model_routes(unique)):
+                for i in missing[text]:
+                    routes[i] = route
+                if cache is not None:
+                    cache.put(text, route)
+        return routes
+
+    def plan_many(self, tasks: list) -> list:
+        """Returns the agent sequence of every task, in order; each list is the caller's to modify."""
+        return [list(self.plans[route]) for route in self.route_many(tasks)]
+
+    def plan(self, task: str) -> list:
+        return self.plan_many([task])[0]
+
+    def stats(self) -> dict:
+        stats = {"model": self.model is not None}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        return stats
@@ -1,48 +1,193 @@
 import ast
-import flake8.api.legacy as flake8
-import tempfile
-import os
+import copy
+import hashlib
+import re
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
 
-from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.logger_manager import LazyLogger
+from agentnexus.core.metrics import Metrics
 
 class CodeValidator:
 
-    
-    logger = LoggerManager.get_logger("CodeValidator")
-        
+
+    # Built on first use so importing this module has no logging side effects
+    logger = LazyLogger("CodeValidator")
+
+    # Name reported to flake8 for in-memory code; used for per-file-ignores matching
+    FILENAME = "generated_code.py"
+    CACHE_SIZE = 512
+    _FLAKE8_LINE = re.compile(r"^.*?:(\d+):(\d+): (\w+) (.*)$")
+
+    _style_guide = None
+    _linter = None
+    _lock = threading.Lock()
+    _cache = OrderedDict()
+
     @staticmethod
     def validate_python(code:str) -> dict:
         '''Validates python code'''
-        temp_file = None
+        metrics = Metrics.get_instance()
+        key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        cached = CodeValidator._cache_get(key)
+        if cached is not None:
+            metrics.inc("agentnexus_cache_hits_total", cache="validation")
+            CodeValidator.logger.debug("Validation result served from cache.")
+            return cached
+
         CodeValidator.logger.info("Validating Python code.")
 
         try:
-            ast.parse(code)
+            with metrics.timer("syntax_check"):
+                tree = ast.parse(code)
             CodeValidator.logger.debug("Syntax check passed.")
 
-            with tempfile.NamedTemporaryFile(mode='w', suffix=".py", delete=False) as temp_file:
-                temp_file.write(code)
-                temp_file_path = temp_file.name
-
-            style_guide = flake8.get_style_guide()
-            report = style_guide.check_files([temp_file_path])
+            with metrics.timer("lint"):
+                total_errors, diagnostics = CodeValidator._lint(code, tree)
 
-            CodeValidator.logger.info(f"Linter found {report.total_errors} errors.")
+            CodeValidator.logger.info("Linter found %s errors.", total_errors)
 
-            return {
-                "is_valid": report.total_errors == 0,
-                "linter_errors": report.total_errors
+            result = {
+                "is_valid": total_errors == 0,
+                "linter_errors": total_errors,
+                "diagnostics": diagnostics
             }
-    
+
         except SyntaxError as e:
             CodeValidator.logger.error(f"Syntax Error: {e}", exc_info=True)
-            return {
+            result = {
                 "is_valid": False,
-                "linter_errors": f"Syntax Error: {str(e)}"
+                "linter_errors": f"Syntax Error: {str(e)}",
+                "diagnostics": [{
+                    "code": "E999",
+                    "line": e.lineno,
+                    "col": e.offset,
+                    "message": f"SyntaxError: {e.msg}"
+                }]
             }
-        
-        finally:
-            if temp_file and os.path.exists(temp_file.name):
-                os.remove(temp_file.name)
 
-    
\ No newline at end of file
+        CodeValidator._cache_put(key, result)
+        return copy.deepcopy(result)
+
+    @classmethod
+    def _cache_get(cls, key: str):
+        with cls._lock:
+            result = cls._cache.get(key)
+            if result is None:
+                return None
+            cls._cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    @classmethod
+    def _cache_put(cls, key: str, result: dict):
+        with cls._lock:
+            cls._cache[key] = result
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _get_linter(cls) -> str:
+        '''
+        Builds the flake8 style guide once per process and probes the flake8
+        internals in-memory linting relies on. Returns "in_memory", or
+        "subprocess" when they are unavailable.
+        '''
+        with cls._lock:
+            if cls._linter is None:
+                try:
+                    import flake8.api.legacy as flake8
+                    style_guide = flake8.get_style_guide()
+                    cls._flake8_internals()
+                    # Attributes _lint_in_memory uses; missing ones mean an incompatible flake8 release
+                    application = style_guide._application
+                    (application.plugins.checkers, application.options.disable_noqa,
+                     application.guide.style_guide_for)
+                    cls._style_guide = style_guide
+                    cls._linter = "in_memory"
+                except (ImportError, AttributeError) as e:
+                    cls.logger.warning("In-memory flake8 linting unavailable (%s); running flake8 in a subprocess.", e)
+                    cls._linter = "subprocess"
+            return cls._linter
+
+    @staticmethod
+    def _flake8_internals():
+        from flake8.checker import FileChecker
+        from flake8.processor import FileProcessor
+        from flake8.style_guide import Decision
+        try:
+            from flake8.violation import Violation
+        except ImportError:
+            from flake8.style_guide import Violation
+        return FileChecker, FileProcessor, Decision, Violation
+
+    @staticmethod
+    def _lint(code: str, tree: ast.AST):
+        '''Returns (total_errors, diagnostics) for code that already parsed'''
+        if CodeValidator._get_linter() == "in_memory":
+            diagnostics = CodeValidator._lint_in_memory(CodeValidator._style_guide, code, tree)
+        else:
+            diagnostics = CodeValidator._lint_subprocess(code)
+        return len(diagnostics), diagnostics
+
+    @staticmethod
+    def _lint_in_memory(style_guide, code: str, tree: ast.AST) -> list:
+        FileChecker, FileProcessor, Decision, Violation = CodeValidator._flake8_internals()
+        class InMemoryProcessor(FileProcessor):
+            def build_ast(self):
+                return tree
+
+        class InMemoryChecker(FileChecker):
+            def _make_processor(self):
+                return InMemoryProcessor(self.filename, self.options, lines=code.splitlines(True))
+
+        application = style_guide._application
+        checker = InMemoryChecker(
+            filename=CodeValidator.FILENAME,
+            plugins=application.plugins.checkers,
+            options=application.options
+        )
+        if not checker.should_process:
+            return []
+        _, results, _ = checker.run_checks()
+
+        guide = application.guide.style_guide_for(CodeValidator.FILENAME)
+        disable_noqa = application.options.disable_noqa
+        diagnostics = []
+        for error_code, line, column, text, physical_line in results:
+            if guide.should_report_error(error_code) is not Decision.Selected:
+                continue
+            # flake8 reports 0-indexed columns and shifts them when reporting
+            column = (column or 0) + 1
+            violation = Violation(error_code, CodeValidator.FILENAME, line, column, text, physical_line)
+            if violation.is_inline_ignored(disable_noqa):
+                continue
+            diagnostics.append({"code": error_code, "line": line, "col": column, "message": text})
+
+        diagnostics.sort(key=lambda d: (d["line"], d["col"], d["code"]))
+        return diagnostics
+
+    @staticmethod
+    def _lint_subprocess(code: str) -> list:
+        '''Lints with `flake8 -`; raises if flake8 could not run rather than reporting clean code'''
+        completed = subprocess.run(
+            [sys.executable, "-m", "flake8", "--stdin-display-name", CodeValidator.FILENAME, "-"],
+            input=code, capture_output=True, text=True
+        )
+        diagnostics = []
+        for line in completed.stdout.splitlines():
+            match = CodeValidator._FLAKE8_LINE.match(line)
+            if match:
+                row, column, error_code, text = match.groups()
+                diagnostics.append({"code": error_code, "line": int(row), "col": int(column), "message": text})
+        if completed.returncode not in (0, 1) or (completed.returncode == 1 and not diagnostics):
+            raise RuntimeError(f"flake8 failed with exit code {completed.returncode}: {completed.stderr.strip()}")
+        diagnostics.sort(key=lambda d: (d["line"], d["col"], d["code"]))
+        return diagnostics
@@ -0,0 +1,193 @@
+import json
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.core.logger_manager import LoggerManager
+from agentnexus.core.interpreter_worker import HEADER
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interpreter_worker.py")
+
+class WorkerError(Exception):
+    """Raised when a worker interpreter crashes or stops responding."""
+
+
+class WorkerTimeout(WorkerError):
+    """Raised when an execution exceeds its timeout."""
+
+
+class InterpreterWorker:
+    """A single pre-forked interpreter that executes code sent over its pipes."""
+
+    def __init__(self, preload_modules=(), memory_limit_mb: int = None, startup_timeout: float = 60.0):
+        self.runs = 0
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        try:
+            self._send({"preload": list(preload_modules), "memory_limit_mb": memory_limit_mb})
+            ready = self._receive(startup_timeout)
+            self.preload_errors = ready.get("preload_errors", {})
+        except BaseException:
+            # A worker that never became ready must not outlive the failed handshake
+            self.kill()
+            raise
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _send(self, message: dict):
+        payload = json.dumps(message).encode("utf-8")
+        try:
+            self.process.stdin.write(HEADER.pack(len(payload)) + payload)
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"Worker pipe closed: {e}")
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        fd = self.process.stdout.fileno()
+        chunks = []
+        remaining = size
+        while remaining:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                raise WorkerTimeout("Execution timed out")
+            readable, _, _ = select.select([fd], [], [], timeout)
+            if not readable:
+                raise WorkerTimeout("Execution timed out")
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                raise WorkerError(f"Worker exited with code {self.process.wait()}")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _receive(self, timeout: float) -> dict:
+        deadline = time.monotonic() + timeout if timeout else None
+        (length,) = HEADER.unpack(self._read_exact(HEADER.size, deadline))
+        return json.loads(self._read_exact(length, deadline).decode("utf-8"))
+
+    def run(self, code: str, timeout: float = None) -> dict:
+        self._send({"code": code})
+        result = self._receive(timeout)
+        self.runs += 1
+        return result
+
+    def kill(self):
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+class InterpreterPool:
+    """
+    Pool of warm worker interpreters for ExecutionEngine.
+    Workers are recycled after `max_runs` executions, on timeout and on crash.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, size: int = 2, preload_modules=(), timeout: float = 60.0,
+                 memory_limit_mb: int = None, max_runs: int = 100):
+        self.size = size
+        self.preload_modules = tuple(preload_modules)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_runs = max_runs
+        self.logger = LoggerManager.get_logger("InterpreterPool")
+        self._idle = queue.Queue()
+        self._closed = False
+
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    @classmethod
+    def get_instance(cls):
+        """Returns the process-wide pool, built from ConfigManager on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                config = ConfigManager.get_config()
+                cls._instance = cls(
+                    size=config["pool_size"],
+                    preload_modules=config["preload_modules"],
+                    timeout=config["execution_timeout"],
+                    memory_limit_mb=config["memory_limit_mb"],
+                    max_runs=config["max_runs_per_worker"]
+                )
+            return cls._instance
+
+    def _spawn(self) -> InterpreterWorker:
+        worker = InterpreterWorker(self.preload_modules, self.memory_limit_mb)
+        if worker.preload_errors:
+            self.logger.warning("[InterpreterPool] Preload failed: %s", worker.preload_errors)
+        return worker
+
+    def _replace(self, worker: InterpreterWorker):
+        """Kills `worker` and warms a replacement in the background."""
+        worker.kill()
+
+        def _respawn():
+            try:
+                self._idle.put(self._spawn())
+            except Exception as e:
+                self.logger.error(f"[InterpreterPool] Failed to start worker: {e}", exc_info=True)
+                self._idle.put(None)
+
+        if not self._closed:
+            threading.Thread(target=_respawn, daemon=True).start()
+
+    def execute(self, code: str, timeout: float = None) -> dict:
+        """
+        Runs `code` on an idle worker and returns returncode, stdout, stderr and
+        cpu_time. Raises WorkerTimeout or WorkerError (after replacing the
+        worker), as a subprocess run raises on timeout, so a failed run is never
+        mistaken for the code's own result.
+        """
+        if self._closed:
+            raise WorkerError("Interpreter pool is shut down")
+        timeout = timeout if timeout is not None else self.timeout
+
+        worker = self._idle.get()
+        if worker is None:
+            worker = self._spawn()
+
+        try:
+            result = worker.run(code, timeout)
+        except WorkerTimeout:
+            self._replace(worker)
+            raise WorkerTimeout(f"Execution exceeded {timeout}s")
+        except WorkerError as e:
+            self.logger.error(f"[InterpreterPool] Worker crashed: {e}")
+            self._replace(worker)
+            raise WorkerError(f"Worker crashed: {e}")
+
+        if worker.runs >= self.max_runs or not worker.alive:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return result
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.kill()
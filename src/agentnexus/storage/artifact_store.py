@@ -0,0 +1,278 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class ArtifactStore:
+    """
+    Content-addressed, write-once blob store.
+    Blobs live at objects/<first two hex chars>/<sha256>[suffix], so identical
+    artifacts are stored once. Blobs put with `compress=False` and a suffix
+    (e.g. ".py") are plain files that can be opened or run in place. A SQLite
+    index records blob metadata and the references linking tasks to blobs;
+    `gc()` removes unreferenced blobs.
+    """
+
+    SUFFIXES = {"zstd": ".zst", "gzip": ".gz", None: ""}
+
+    def __init__(self, root: str, compress_threshold: int = 65536, compression: str = "auto"):
+        if compression == "auto":
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        if compression not in self.SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.tmp_dir = os.path.join(root, "tmp")
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._db = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, stored_size INTEGER NOT NULL, "
+            "encoding TEXT, suffix TEXT NOT NULL DEFAULT '', created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS refs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, digest TEXT NOT NULL, task TEXT, "
+            "name TEXT, created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_refs_digest ON refs(digest)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_refs_task ON refs(task)")
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _object_path(self, digest: str, encoding: str = None, suffix: str = "") -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:] + (suffix or "") + self.SUFFIXES[encoding])
+
+    def _layout_of(self, digest: str):
+        """(encoding, suffix) of a stored blob."""
+        row = self._db.execute("SELECT encoding, suffix FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return row[0], row[1]
+
+    @staticmethod
+    def digest_from_path(path: str) -> str:
+        shard, name = os.path.split(path)
+        return os.path.basename(shard) + name.split(".", 1)[0]
+
+    def path(self, digest: str) -> str:
+        """Filesystem path of a stored blob (compressed blobs carry a .zst/.gz suffix)."""
+        with self._lock:
+            return self._object_path(digest, *self._layout_of(digest))
+
+    def exists(self, digest: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def _compress(self, data: bytes, compress: bool = True):
+        if not compress or self.compression is None or len(data) < self.compress_threshold:
+            return data, None
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data), "zstd"
+        return gzip.compress(data, mtime=0), "gzip"
+
+    @staticmethod
+    def _decompress(data: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            if zstandard is None:
+                raise ValueError("Reading zstd artifacts requires the 'zstandard' package")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if encoding == "gzip":
+            return gzip.decompress(data)
+        return data
+
+    def _write_blob(self, path: str, payload: bytes):
+        """Writes to a temp file and renames it into place, so readers never see a partial blob."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put(self, data, task: str = None, name: str = None, suffix: str = "", compress: bool = True) -> str:
+        """
+        Stores `data` (bytes or str) once and records a reference to it. Returns
+        its digest. `suffix` is appended to the blob's file name; with
+        `compress=False` the blob is always stored as is.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = self.digest(data)
+        now = time.time()
+
+        with self._lock:
+            if not self.exists(digest):
+                payload, encoding = self._compress(data, compress)
+                path = self._object_path(digest, encoding, suffix)
+                if not os.path.exists(path):
+                    self._write_blob(path, payload)
+                self._db.execute(
+                    "INSERT OR IGNORE INTO objects (digest, size, stored_size, encoding, suffix, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, len(data), len(payload), encoding, suffix, now)
+                )
+            else:
+                self._relayout(digest, data, suffix, compress)
+            self._db.execute(
+                "INSERT INTO refs (digest, task, name, created_at) VALUES (?, ?, ?, ?)",
+                (digest, task, name, now)
+            )
+        return digest
+
+    def _relayout(self, digest: str, data: bytes, suffix: str, compress: bool):
+        """Rewrites a blob stored with another suffix or compression than this put asks for."""
+        encoding, stored_suffix = self._layout_of(digest)
+        if suffix == stored_suffix and (compress or encoding is None):
+            return
+        old_path = self._object_path(digest, encoding, stored_suffix)
+        payload, encoding = self._compress(data, compress)
+        self._write_blob(self._object_path(digest, encoding, suffix), payload)
+        self._db.execute("UPDATE objects SET stored_size = ?, encoding = ?, suffix = ? WHERE digest = ?",
+                         (len(payload), encoding, suffix, digest))
+        try:
+            os.remove(old_path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, digest: str) -> bytes:
+        with self._lock:
+            encoding, suffix = self._layout_of(digest)
+        with open(self._object_path(digest, encoding, suffix), "rb") as blob:
+            return self._decompress(blob.read(), encoding)
+
+    @contextmanager
+    def batch(self):
+        """Groups many puts into a single index transaction."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._db.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._db.execute("COMMIT")
+
+    def refs(self, digest: str = None, task: str = None) -> list:
+        """References as (digest, task, name, created_at), filtered by blob and/or task."""
+        clauses, params = [], []
+        if digest is not None:
+            clauses.append("digest = ?")
+            params.append(digest)
+        if task is not None:
+            clauses.append("task = ?")
+            params.append(task)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._db.execute(
+                f"SELECT digest, task, name, created_at FROM refs{where} ORDER BY id", params
+            ).fetchall()
+
+    def remove_refs(self, digest: str = None, task: str = None) -> int:
+        """Drops references; the blobs themselves are reclaimed by `gc()`."""
+        if digest is None and task is None:
+            raise ValueError("remove_refs needs a digest or a task")
+        clauses, params = [], []
+        if digest is not None:
+            clauses.append("digest = ?")
+            params.append(digest)
+        if task is not None:
+            clauses.append("task = ?")
+            params.append(task)
+        with self._lock:
+            return self._db.execute(f"DELETE FROM refs WHERE {' AND '.join(clauses)}", params).rowcount
+
+    def gc(self, grace_period: float = 3600) -> dict:
+        """
+        Deletes blobs with no references that are older than `grace_period`
+        seconds, plus stray temp files. The grace period protects blobs whose
+        reference is being written by another process.
+        """
+        cutoff = time.time() - grace_period
+        removed = freed = 0
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT digest, encoding, suffix, stored_size FROM objects "
+                "WHERE created_at < ? AND digest NOT IN (SELECT digest FROM refs)",
+                (cutoff,)
+            ).fetchall()
+            for digest, encoding, suffix, stored_size in rows:
+                path = self._object_path(digest, encoding, suffix)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+                removed += 1
+                freed += stored_size
+                try:
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+
+            # Blobs written by a put whose batch was rolled back never reached the index
+            indexed = {row[0] for row in self._db.execute("SELECT digest FROM objects")}
+            for shard in os.scandir(self.objects_dir):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    digest = self.digest_from_path(entry.path)
+                    try:
+                        if digest not in indexed and entry.stat().st_mtime < cutoff:
+                            freed += entry.stat().st_size
+                            os.remove(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+
+        for entry in os.scandir(self.tmp_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        return {"removed": removed, "freed_bytes": freed}
+
+    def stats(self) -> dict:
+        with self._lock:
+            objects, size, stored_size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM objects"
+            ).fetchone()
+            refs = self._db.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        return {"objects": objects, "refs": refs, "size": size, "stored_size": stored_size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,22 +1,42 @@
-import os
-import uuid
+from agentnexus.core.config_manager import ConfigManager
+from agentnexus.storage.artifact_store import ArtifactStore
 
 class FileManager:
     """Manages file storage for generated code"""
 
     BASE_DIR = "datafiles"
+    CODE_NAME = "generated_code.py"
+    CODE_SUFFIX = ".py"
 
     def __init__(self):
-        os.makedirs(self.BASE_DIR, exist_ok=True)
+        config = ConfigManager.get_config()
+        self.store = ArtifactStore(
+            self.BASE_DIR,
+            compress_threshold=config["compress_threshold"],
+            compression=config["compression"]
+        )
 
-    def save_code(self, code: str) -> str:
-        """Saves generated code in a UUID-based folder"""
-        folder_name = str(uuid.uuid4())
-        folder_path = os.path.join(self.BASE_DIR, folder_name)
-        os.makedirs(folder_path, exist_ok=True)
+    def store_code(self, code: str, task: str = None) -> str:
+        """Saves generated code in the content-addressed store and returns its digest; identical code is stored once"""
+        return self.store.put(code, task=task, name=self.CODE_NAME, suffix=self.CODE_SUFFIX, compress=False)
 
-        file_path = os.path.join(folder_path, "generated_code.py")
-        with open(file_path, "w") as f:
-            f.write(code)
+    def save_code(self, code: str, task: str = None) -> str:
+        """Saves generated code and returns the path of its blob, a plain .py file ready to open or run"""
+        return self.store.path(self.store_code(code, task))
 
-        return file_path
+    def save_many(self, items) -> list:
+        """Saves (code, task) pairs in one batch and returns their .py paths"""
+        with self.store.batch():
+            return [self.save_code(code, task) for code, task in items]
+
+    def digest_of(self, path: str) -> str:
+        """Digest of code saved by save_code, given its .py path or the digest itself"""
+        return self.store.digest_from_path(path)
+
+    def load_code(self, path: str) -> str:
+        """Reads back code saved by save_code, given its path or digest"""
+        return self.store.get(self.digest_of(path)).decode("utf-8")
+
+    def collect_garbage(self, grace_period: float = 3600) -> dict:
+        """Removes stored code that no task references any more"""
+        return self.store.gc(grace_period)